@@ -52,6 +52,8 @@ class Config:
     def __init__(self, config_file: str = "config.yaml"):
         self.config_file = Path(config_file)
         self.config_data = {}
+        # Bumped whenever the configuration changes so callers can cache derived views
+        self.version = 0
         self._load_config()
         
         # Proxy server settings
@@ -123,6 +125,7 @@ class Config:
     
     def _save_config(self):
         """Save configuration to file"""
+        self.version += 1
         try:
             with open(self.config_file, 'w') as f:
                 yaml.dump(self.config_data, f, default_flow_style=False)
@@ -204,6 +207,7 @@ class Config:
         """Update the recorded latency for a server"""
         if server_name in self.config_data.get('servers', {}):
             self.config_data['servers'][server_name]['latency_ms'] = latency_ms
+            self.version += 1
             # Save in background (fire and forget)
             try:
                 import asyncio
@@ -66,6 +66,10 @@ class StatsCollector:
         self._total_tokens = 0
         self._active_connections = 0
         
+        # Cached detailed summary as (created_at, hours, stats)
+        self._summary_cache: Optional[tuple] = None
+        self.summary_ttl = 5.0
+        
         # Lock for thread safety
         self._lock = asyncio.Lock()
     
@@ -231,6 +235,17 @@ class StatsCollector:
             'period_hours': hours
         }
     
+    async def get_cached_summary(self, hours: int = 24) -> Dict[str, Any]:
+        """Get detailed statistics, reusing a snapshot younger than summary_ttl"""
+        now = time.time()
+        cached = self._summary_cache
+        if cached is not None and cached[1] == hours and now - cached[0] < self.summary_ttl:
+            return cached[2]
+        
+        stats = await self.get_detailed_stats(hours)
+        self._summary_cache = (now, hours, stats)
+        return stats
+    
     async def get_hourly_stats(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get hourly statistics breakdown"""
         
@@ -431,6 +446,7 @@ class StatsCollector:
             self._total_tokens = 0
             self.start_time = time.time()
             self.recent_requests.clear()
+            self._summary_cache = None
             
             # Delete stats file
             try:
@@ -5,11 +5,13 @@ Provides rich interactive interfaces for monitoring and managing the proxy.
 """
 
 import asyncio
+import os
+import sys
 import time
-from datetime import datetime, timezone
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Any
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.layout import Layout
 from rich.live import Live
 from rich.panel import Panel
@@ -18,35 +20,168 @@ from rich.text import Text
 from rich.progress import Progress, BarColumn, TaskProgressColumn, TextColumn
 from rich.columns import Columns
 from rich.align import Align
+from rich.control import Control
+from rich.segment import Segment
 from rich import box
 
 from cli.config import Config
 from cli.stats import StatsCollector
 from cli.proxy import ProxyManager
-from cli.utils import format_duration, format_bytes, format_number
+from cli.utils import console as shared_console, format_duration, format_bytes, format_number
+
+# Markup templates parsed once at import instead of on every frame/menu redraw
+_HEADER_TITLE = Text.from_markup("[bold blue]🚀 Anthropic Proxy TUI[/bold blue]\n")
+_ACTIONS_TEXT = Text.from_markup(
+    "[bold cyan]Quick Actions:[/bold cyan]\n"
+    "[dim]\\[q]uit  \\[r]estart  \\[s]witch  \\[l]ogs  \\[c]onfig  \\[h]elp[/dim]"
+)
+_FOOTER_TEXT = Text("Press 'q' to quit, 'h' for help", style="dim")
+_HELP_TEXT = Text.from_markup("""
+[bold cyan]Help:[/bold cyan]
+[yellow]q[/yellow] - Quit TUI
+[yellow]r[/yellow] - Restart proxy
+[yellow]s[/yellow] - Switch server
+[yellow]l[/yellow] - View logs
+[yellow]c[/yellow] - View config
+[yellow]h[/yellow] - Show this help
+[yellow]Ctrl+C[/yellow] - Force quit
+""")
+_WELCOME_TEXT = Text.from_markup(
+    "[bold blue]🚀 Anthropic Proxy TUI[/bold blue]\n\n"
+    "[green]Starting Terminal User Interface...[/green]\n"
+    "[dim]Live statistics monitoring with server switching capabilities[/dim]\n"
+    "[dim]Press 'h' for help, 'q' to quit[/dim]"
+)
+_MENU_TITLE = Text.from_markup("[bold blue]🚀 Anthropic Proxy CLI[/bold blue]")
+_STATS_ERROR_PANEL = Panel(
+    Text("Stats collector unavailable", style="red"),
+    title="[bold]Live Statistics[/bold]",
+    box=box.ROUNDED,
+    border_style="red"
+)
+
+def _raw_control(sequence: str) -> Control:
+    """Wrap a raw escape sequence so it can be queued with Console.control"""
+    control = Control()
+    control.segment = Segment(sequence)
+    return control
+
+# DEC private mode 2026 (synchronized output); terminals without support ignore it
+_SYNC_UPDATE_BEGIN = _raw_control("\x1b[?2026h")
+_SYNC_UPDATE_END = _raw_control("\x1b[?2026l")
+
+@asynccontextmanager
+async def raw_mode(fd: int):
+    """Put a terminal into raw mode for the duration of the block
+    
+    The termios calls run in a worker thread so a slow or wedged tty
+    cannot stall the event loop while the TUI is starting or exiting.
+    """
+    import tty
+    import termios
+    
+    # run_in_executor rather than asyncio.to_thread, which needs Python 3.9
+    loop = asyncio.get_running_loop()
+    
+    # Save terminal settings
+    old_settings = await loop.run_in_executor(None, termios.tcgetattr, fd)
+    try:
+        await loop.run_in_executor(None, tty.setraw, fd)
+        yield fd
+    finally:
+        # Restore terminal settings
+        await loop.run_in_executor(None, termios.tcsetattr, fd, termios.TCSADRAIN, old_settings)
+
+class SynchronizedLive(Live):
+    """Live display that wraps each frame in a synchronized-update block
+    
+    Supporting terminals hold back drawing until the end marker arrives, so
+    a frame never shows up half-painted.
+    """
+    
+    def __init__(self, *args, synchronized: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.synchronized = synchronized
+    
+    def refresh(self) -> None:
+        if not self.synchronized:
+            super().refresh()
+            return
+        
+        # The outer console context buffers the markers together with the
+        # frame, so the whole update is flushed in a single write
+        with self._lock, self.console:
+            self.console.control(_SYNC_UPDATE_BEGIN)
+            super().refresh()
+            self.console.control(_SYNC_UPDATE_END)
 
 class ProxyTUI:
     """Main TUI application for proxy monitoring"""
     
-    def __init__(self):
-        self.console = Console()
+    # Keystroke -> (handler method name, whether it must be awaited)
+    _KEY_HANDLERS = {
+        'q': ('_quit', False),
+        'r': ('_restart_proxy', True),
+        's': ('_switch_server', True),
+        'l': ('_show_logs', True),
+        'c': ('_show_config', True),
+        'h': ('_show_help', False),
+        '\x03': ('_quit', False),  # Ctrl+C
+    }
+    
+    def __init__(self, console: Optional[Console] = None):
+        # Share one Console so terminal capabilities are probed only once
+        self.console = console or shared_console
         self.config = Config()
         self.stats = StatsCollector(self.config)
         self.proxy = ProxyManager(self.config)
         self.running = True
         
-        # Store previous stats for trend calculation
-        self.previous_stats = {}
+        # Previous (total_requests, total_tokens, avg_response_time) for trend calculation
+        self._prev_scalars: Optional[tuple] = None
+        
+        # Display refresh cadence (seconds)
+        self._refresh_interval = max(0.1, float(
+            self.config.get_cli_setting('tui_refresh_interval', self.config.get_refresh_interval())
+        ))
+        self._last_stats_panel: Optional[Panel] = None
+        
+        # Latest snapshot published by the background stats producer
+        self._latest_stats: Optional[Dict[str, Any]] = None
+        self._stats_version = 0
+        self._rendered_stats_version = -1
+        
+        # Proxy status as (checked_at, is_running), refreshed in the background
+        self._status_ttl = 2.0
+        self._status_cache: Optional[tuple] = None
+        
+        # Servers panel keyed by (config version, current server); the
+        # actions panel never changes so it is built once
+        self._servers_panel_cache: Dict[tuple, Panel] = {}
+        self._actions_panel = self._build_actions_panel()
+        self._layout: Optional[Layout] = None
+        
+        # Header clock as (epoch_second, formatted)
+        self._clock_cache = (-1, "")
+        
+        # Synchronized output only makes sense on a real (non-legacy) terminal
+        self._supports_sync = bool(
+            self.config.get_cli_setting('tui_synchronized_output', True)
+            and self.console.is_terminal
+            and not self.console.is_dumb_terminal
+            and not self.console.legacy_windows
+        )
         
     def create_header(self) -> Panel:
         """Create the header panel"""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        current_time = self._current_time_str()
         current_server = self.config.get_current_server()
         
-        header_text = Text.from_markup(
-            f"[bold blue]🚀 Anthropic Proxy TUI[/bold blue]\n"
-            f"[dim]Server: [cyan]{current_server}[/cyan] | "
-            f"Time: {current_time}[/dim]"
+        header_text = Text.assemble(
+            _HEADER_TITLE,
+            ("Server: ", "dim"),
+            (current_server, "dim cyan"),
+            (f" | Time: {current_time}", "dim")
         )
         
         return Panel(
@@ -55,6 +190,13 @@ class ProxyTUI:
             style="bold blue"
         )
     
+    def _current_time_str(self) -> str:
+        """Get the header clock string, formatted at most once per second"""
+        now = int(time.time())
+        if now != self._clock_cache[0]:
+            self._clock_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+        return self._clock_cache[1]
+    
     def create_status_panel(self) -> Panel:
         """Create the status panel"""
         # Create status table
@@ -63,10 +205,9 @@ class ProxyTUI:
         status_table.add_column("Value", style="white")
         
         # Get proxy status
+        is_running = None
         try:
-            # This would be an async call in a real implementation
-            # For now, we'll simulate it
-            is_running = self._simulate_proxy_status()
+            is_running = self._get_proxy_status()
             
             status_table.add_row(
                 "Proxy Status", 
@@ -90,25 +231,44 @@ class ProxyTUI:
             status_table,
             title="[bold]Status[/bold]",
             box=box.ROUNDED,
-            border_style="green" if self._simulate_proxy_status() else "red"
+            border_style="green" if is_running else "red"
         )
     
+    def _get_proxy_status(self) -> bool:
+        """Get the proxy status, reusing the cached value while it is fresh"""
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache[0] < self._status_ttl:
+            return self._status_cache[1]
+        
+        is_running = self._simulate_proxy_status()
+        self._status_cache = (now, is_running)
+        return is_running
+    
+    async def _refresh_status_loop(self):
+        """Keep the cached proxy status fresh off the render path"""
+        while self.running:
+            try:
+                self._status_cache = (time.monotonic(), self._simulate_proxy_status())
+            except Exception:
+                self._status_cache = None
+            await asyncio.sleep(self._status_ttl)
+    
     def _simulate_proxy_status(self) -> bool:
         """Simulate proxy status check (simplified)"""
         # In real implementation, this would check if proxy is actually running
         return True
     
-    async def create_stats_panel(self) -> Panel:
-        """Create the statistics panel with real data"""
+    def _build_stats_panel(self, stats: Optional[Dict[str, Any]]) -> Panel:
+        """Build the statistics panel from a stats snapshot"""
+        if stats is None:
+            return _STATS_ERROR_PANEL
+        
         stats_table = Table()
         stats_table.add_column("Metric", style="cyan", width=18)
         stats_table.add_column("Current", style="white", justify="right")
         stats_table.add_column("Trend", style="green", width=8)
         
         try:
-            # Get real stats from the stats collector
-            stats = await self._get_real_stats()
-            
             # Calculate trends
             total_requests_trend = self._calculate_trend(stats.get('total_requests', 0), 'requests')
             tokens_trend = self._calculate_trend(stats.get('total_tokens', 0), 'tokens')
@@ -122,15 +282,9 @@ class ProxyTUI:
             stats_table.add_row("Active Conn.", str(stats.get('active_connections', 0)), "—")
             stats_table.add_row("Uptime", format_duration(stats.get('uptime', 0)), "—")
             
-        except Exception as e:
+        except Exception:
             # Fallback to error state
-            stats_table.add_row("Total Requests", "[red]Error[/red]", "—")
-            stats_table.add_row("Requests/min", "[red]Error[/red]", "—")
-            stats_table.add_row("Total Tokens", "[red]Error[/red]", "—")
-            stats_table.add_row("Success Rate", "[red]Error[/red]", "—")
-            stats_table.add_row("Avg Response", "[red]Error[/red]", "—")
-            stats_table.add_row("Active Conn.", "[red]Error[/red]", "—")
-            stats_table.add_row("Uptime", "[red]Error[/red]", "—")
+            return _STATS_ERROR_PANEL
         
         return Panel(
             stats_table,
@@ -139,28 +293,49 @@ class ProxyTUI:
             border_style="blue"
         )
     
+    async def _stats_producer(self):
+        """Collect stats in the background so rendering never waits on them"""
+        while self.running:
+            try:
+                self._latest_stats = await self._get_real_stats()
+            except Exception:
+                self._latest_stats = None
+            self._stats_version += 1
+            await asyncio.sleep(self._refresh_interval)
+    
+    def _current_stats_panel(self) -> Panel:
+        """Get the stats panel for the latest snapshot, rebuilding it only when it changed"""
+        if self._last_stats_panel is None or self._rendered_stats_version != self._stats_version:
+            self._last_stats_panel = self._build_stats_panel(self._latest_stats)
+            self._rendered_stats_version = self._stats_version
+        return self._last_stats_panel
+    
     async def _get_real_stats(self) -> Dict[str, Any]:
         """Get real statistics from the stats collector"""
         try:
             # Try to get current stats from the stats collector
             stats = await self.stats.get_current_stats()
             
-            # Store previous stats for trend calculation
-            if hasattr(self, 'previous_stats') and self.previous_stats:
+            # Only the three trended scalars are kept between ticks
+            current = (
+                stats.get('total_requests', 0),
+                stats.get('total_tokens', 0),
+                stats.get('avg_response_time', 0.0)
+            )
+            
+            if self._prev_scalars is not None:
                 # Compare with previous stats
                 trend_data = {}
-                for key in ['total_requests', 'total_tokens', 'avg_response_time']:
-                    if key in stats and key in self.previous_stats:
-                        prev = self.previous_stats[key]
-                        curr = stats[key]
-                        if prev > 0:
-                            change = ((curr - prev) / prev) * 100
-                            trend_data[f'{key}_trend'] = change
-                
-                self.previous_stats = stats.copy()
-            else:
-                # First time getting stats
-                self.previous_stats = stats.copy()
+                for key, prev, curr in zip(
+                    ('total_requests', 'total_tokens', 'avg_response_time'),
+                    self._prev_scalars,
+                    current
+                ):
+                    if prev > 0:
+                        change = ((curr - prev) / prev) * 100
+                        trend_data[f'{key}_trend'] = change
+            
+            self._prev_scalars = current
             
             return stats
             
@@ -197,7 +372,18 @@ class ProxyTUI:
             return "—"
     
     def create_servers_panel(self) -> Panel:
-        """Create the servers panel"""
+        """Create the servers panel, reusing the cached one while the config is unchanged"""
+        current_server = self.config.get_current_server()
+        key = (self.config.version, current_server)
+        
+        panel = self._servers_panel_cache.get(key)
+        if panel is None:
+            self._servers_panel_cache.clear()
+            panel = self._servers_panel_cache[key] = self._build_servers_panel(current_server)
+        return panel
+    
+    def _build_servers_panel(self, current_server: str) -> Panel:
+        """Build the servers panel"""
         servers_table = Table()
         servers_table.add_column("Server", style="cyan", width=12)
         servers_table.add_column("Status", style="white", width=8)
@@ -205,7 +391,6 @@ class ProxyTUI:
         servers_table.add_column("Region", style="white", width=12)
         
         servers = self.config.get_all_servers()
-        current_server = self.config.get_current_server()
         
         for server_name, server_info in servers.items():
             is_current = server_name == current_server
@@ -215,10 +400,8 @@ class ProxyTUI:
             status = "🟢 Online" if has_api_key else "🔴 No Key"
             latency = f"{server_info.latency_ms:.0f}ms"
             
-            row_style = "bold" if is_current else ""
-            
             servers_table.add_row(
-                f"[{row_style}]{server_name}[/{row_style}]",
+                Text(server_name, style="bold" if is_current else ""),
                 status,
                 latency,
                 server_info.region
@@ -233,19 +416,34 @@ class ProxyTUI:
     
     def create_actions_panel(self) -> Panel:
         """Create the quick actions panel"""
-        actions_text = Text.from_markup(
-            "[bold cyan]Quick Actions:[/bold cyan]\n"
-            "[dim][q]uit  [r]estart  [s]witch  [l]ogs  [c]onfig  [h]elp[/dim]"
-        )
-        
+        return self._actions_panel
+    
+    def _build_actions_panel(self) -> Panel:
+        """Build the (static) quick actions panel"""
         return Panel(
-            actions_text,
+            _ACTIONS_TEXT,
             box=box.ROUNDED,
             border_style="magenta"
         )
     
-    def create_layout(self) -> Layout:
-        """Create the main TUI layout"""
+    def create_layout(self, force_rebuild: bool = False) -> Layout:
+        """Create the main TUI layout
+        
+        The split skeleton is built once and reused; later calls only swap
+        the dynamic panels in place.
+        """
+        if self._layout is None or force_rebuild:
+            self._layout = self._build_layout_skeleton()
+        
+        layout = self._layout
+        layout["header"].update(self.create_header())
+        layout["status"].update(self.create_status_panel())
+        layout["servers"].update(self.create_servers_panel())
+        
+        return layout
+    
+    def _build_layout_skeleton(self) -> Layout:
+        """Build the layout splits and the panels that never change"""
         layout = Layout()
         
         # Split into header, main, and footer
@@ -273,14 +471,11 @@ class ProxyTUI:
             Layout(name="actions", size=5)
         )
         
-        # Add panels to layout
-        layout["header"].update(self.create_header())
-        layout["status"].update(self.create_status_panel())
+        # Add static panels to layout
         layout["stats"].update(self.create_header())  # Placeholder, will be updated async
-        layout["servers"].update(self.create_servers_panel())
         layout["actions"].update(self.create_actions_panel())
         layout["footer"].update(Panel(
-            Text("[dim]Press 'q' to quit, 'h' for help[/dim]", style="dim"),
+            _FOOTER_TEXT,
             box=box.ROUNDED
         ))
         
@@ -288,59 +483,70 @@ class ProxyTUI:
     
     async def update_display(self, live: Live):
         """Update the TUI display"""
+        next_tick = time.monotonic()
         while self.running:
             try:
                 layout = self.create_layout()
                 
-                # Update stats panel with real data
-                stats_panel = await self.create_stats_panel()
-                layout["stats"].update(stats_panel)
+                # Render the latest snapshot from the stats producer; the
+                # fetch itself runs concurrently and never stalls a frame
+                if self._stats_version:
+                    layout["stats"].update(self._current_stats_panel())
                 
                 live.update(layout)
-                await asyncio.sleep(2)  # Update every 2 seconds
+                
+                # Schedule against the monotonic clock so the cost of
+                # rendering is absorbed by the interval; if it overran,
+                # skip the missed ticks instead of redrawing back to back
+                next_tick += self._refresh_interval
+                now = time.monotonic()
+                if next_tick < now:
+                    next_tick = now + self._refresh_interval
+                await asyncio.sleep(max(0.0, next_tick - now))
             except Exception as e:
                 self.console.print(f"[red]Error updating display: {e}[/red]")
                 break
     
     async def handle_input(self):
         """Handle user input"""
-        import sys
-        import tty
-        import termios
+        fd = sys.stdin.fileno()
+        loop = asyncio.get_running_loop()
+        keys: asyncio.Queue = asyncio.Queue()
         
-        # Save terminal settings
-        old_settings = termios.tcgetattr(sys.stdin)
+        def on_stdin_ready():
+            # Only called once the fd is readable, so this never blocks the loop
+            try:
+                data = os.read(fd, 64)
+            except (BlockingIOError, InterruptedError):
+                return
+            for char in data.decode(errors='ignore'):
+                keys.put_nowait(char)
         
         try:
-            # Set raw mode
-            tty.setraw(sys.stdin.fileno())
-            
-            while self.running:
-                # Read single character
-                char = sys.stdin.read(1)
-                
-                if char == 'q':
-                    self.running = False
-                    break
-                elif char == 'r':
-                    await self._restart_proxy()
-                elif char == 's':
-                    await self._switch_server()
-                elif char == 'l':
-                    await self._show_logs()
-                elif char == 'c':
-                    await self._show_config()
-                elif char == 'h':
-                    self._show_help()
-                elif char == '\x03':  # Ctrl+C
-                    self.running = False
-                    break
+            async with raw_mode(fd):
+                loop.add_reader(fd, on_stdin_ready)
+                try:
+                    while self.running:
+                        # Wait for the next keystroke without blocking the event loop
+                        char = await keys.get()
+                        
+                        entry = self._KEY_HANDLERS.get(char)
+                        if entry is None:
+                            continue
+                        
+                        handler_name, is_async = entry
+                        result = getattr(self, handler_name)()
+                        if is_async:
+                            await result
+                finally:
+                    loop.remove_reader(fd)
                     
         except Exception as e:
             self.console.print(f"[red]Input error: {e}[/red]")
-        finally:
-            # Restore terminal settings
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+    
+    def _quit(self):
+        """Stop the TUI loops"""
+        self.running = False
     
     async def _restart_proxy(self):
         """Restart the proxy"""
@@ -352,6 +558,7 @@ class ProxyTUI:
         """Switch between servers"""
         current = self.config.get_current_server()
         new_server = "cn" if current == "international" else "international"
+        self._servers_panel_cache.clear()
         
         self.console.print(f"[blue]Switching to {new_server}...[/blue]")
         # Implementation would go here
@@ -369,17 +576,7 @@ class ProxyTUI:
     
     def _show_help(self):
         """Show help"""
-        help_text = """
-[bold cyan]Help:[/bold cyan]
-[yellow]q[/yellow] - Quit TUI
-[yellow]r[/yellow] - Restart proxy
-[yellow]s[/yellow] - Switch server
-[yellow]l[/yellow] - View logs
-[yellow]c[/yellow] - View config
-[yellow]h[/yellow] - Show this help
-[yellow]Ctrl+C[/yellow] - Force quit
-        """
-        self.console.print(help_text)
+        self.console.print(_HELP_TEXT)
     
     async def run(self):
         """Run the TUI application"""
@@ -387,15 +584,8 @@ class ProxyTUI:
         self.console.clear()
         
         # Show welcome message
-        welcome_text = Text.from_markup(
-            "[bold blue]🚀 Anthropic Proxy TUI[/bold blue]\n\n"
-            "[green]Starting Terminal User Interface...[/green]\n"
-            "[dim]Live statistics monitoring with server switching capabilities[/dim]\n"
-            "[dim]Press 'h' for help, 'q' to quit[/dim]"
-        )
-        
         self.console.print(Panel(
-            welcome_text,
+            _WELCOME_TEXT,
             box=box.ROUNDED,
             border_style="blue"
         ))
@@ -403,13 +593,21 @@ class ProxyTUI:
         await asyncio.sleep(2)
         
         # Create live display
-        with Live(console=self.console, refresh_per_second=1) as live:
-            # Start display update task
+        with SynchronizedLive(
+            console=self.console,
+            refresh_per_second=1 / self._refresh_interval,
+            synchronized=self._supports_sync
+        ) as live:
+            # Start stats collection and display update tasks
+            stats_task = asyncio.create_task(self._stats_producer())
             display_task = asyncio.create_task(self.update_display(live))
             
             # Start input handling task
             input_task = asyncio.create_task(self.handle_input())
             
+            # Keep the proxy status warm in the background
+            status_task = asyncio.create_task(self._refresh_status_loop())
+            
             try:
                 # Wait for either task to complete
                 await asyncio.gather(display_task, input_task, return_exceptions=True)
@@ -419,10 +617,15 @@ class ProxyTUI:
                 # Cancel tasks
                 display_task.cancel()
                 input_task.cancel()
+                status_task.cancel()
+                stats_task.cancel()
                 
                 # Wait for tasks to finish
                 try:
-                    await asyncio.gather(display_task, input_task, return_exceptions=True)
+                    await asyncio.gather(
+                        display_task, input_task, status_task, stats_task,
+                        return_exceptions=True
+                    )
                 except:
                     pass
         
@@ -432,52 +635,67 @@ class ProxyTUI:
 class InteractiveMenu:
     """Interactive menu for CLI operations"""
     
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, console: Optional[Console] = None):
+        self.console = console or shared_console
         self.config = Config()
         self.proxy = ProxyManager(self.config)
         self.stats = StatsCollector(self.config)
+        
+        # Main menu screens keyed by (is_running, current_server); only a
+        # handful of states are reachable, so each is built once
+        self._title_panel = Panel(
+            _MENU_TITLE,
+            box=box.ROUNDED,
+            border_style="blue"
+        )
+        self._menu_cache: Dict[tuple, Group] = {}
+    
+    def _get_main_menu(self, is_running: bool, current_server: str) -> Group:
+        """Get the main menu screen for the given state"""
+        key = (is_running, current_server)
+        menu = self._menu_cache.get(key)
+        if menu is None:
+            menu = self._menu_cache[key] = self._build_main_menu(is_running, current_server)
+        return menu
+    
+    def _build_main_menu(self, is_running: bool, current_server: str) -> Group:
+        """Build the title and menu table for the given state"""
+        menu_table = Table(show_header=True, box=box.ROUNDED)
+        menu_table.add_column("Option", style="cyan", width=5)
+        menu_table.add_column("Description", style="white")
+        menu_table.add_column("Status", style="green", width=15)
+        
+        menu_items = [
+            ("1", "Show Status", "● Active" if is_running else "○ Inactive"),
+            ("2", "Start Proxy", "" if is_running else "▶ Available"),
+            ("3", "Stop Proxy", "■ Running" if is_running else ""),
+            ("4", "Switch Server", f"→ {current_server}"),
+            ("5", "View Statistics", "📊 Available"),
+            ("6", "View Logs", "📋 Available"),
+            ("7", "Configuration", "⚙️  Available"),
+            ("8", "Server List", "🌐 Available"),
+            ("9", "Launch TUI", "🖥️  Available"),
+            ("0", "Exit", "👋 Goodbye")
+        ]
+        
+        for option, description, status in menu_items:
+            menu_table.add_row(option, description, status)
+        
+        return Group(self._title_panel, menu_table)
     
     async def show_main_menu(self):
         """Show the main interactive menu"""
         while True:
             self.console.clear()
             
-            # Create title
-            title = Panel(
-                Text.from_markup("[bold blue]🚀 Anthropic Proxy CLI[/bold blue]"),
-                box=box.ROUNDED,
-                border_style="blue"
+            # Get current status while warming the statistics summary
+            is_running, _ = await asyncio.gather(
+                self._check_proxy_running(),
+                self._prefetch_statistics()
             )
-            self.console.print(title)
-            
-            # Create menu
-            menu_table = Table(show_header=True, box=box.ROUNDED)
-            menu_table.add_column("Option", style="cyan", width=5)
-            menu_table.add_column("Description", style="white")
-            menu_table.add_column("Status", style="green", width=15)
-            
-            # Get current status
-            is_running = await self._check_proxy_running()
             current_server = self.config.get_current_server()
             
-            menu_items = [
-                ("1", "Show Status", "● Active" if is_running else "○ Inactive"),
-                ("2", "Start Proxy", "" if is_running else "▶ Available"),
-                ("3", "Stop Proxy", "■ Running" if is_running else ""),
-                ("4", "Switch Server", f"→ {current_server}"),
-                ("5", "View Statistics", "📊 Available"),
-                ("6", "View Logs", "📋 Available"),
-                ("7", "Configuration", "⚙️  Available"),
-                ("8", "Server List", "🌐 Available"),
-                ("9", "Launch TUI", "🖥️  Available"),
-                ("0", "Exit", "👋 Goodbye")
-            ]
-            
-            for option, description, status in menu_items:
-                menu_table.add_row(option, description, status)
-            
-            self.console.print(menu_table)
+            self.console.print(self._get_main_menu(is_running, current_server))
             
             # Get user input
             choice = self.console.input("\n[cyan]Enter your choice (0-9):[/cyan] ").strip()
@@ -523,10 +741,16 @@ class InteractiveMenu:
         except:
             return False
     
+    async def _prefetch_statistics(self):
+        """Warm the stats summary cache so the statistics screen opens instantly"""
+        try:
+            await self.stats.get_cached_summary(24)
+        except Exception:
+            pass
+    
     async def _show_status(self):
         """Show detailed status"""
         self.console.clear()
-        self.console.print("[bold blue]📊 Proxy Status[/bold blue]\n")
         
         is_running = await self._check_proxy_running()
         current_server = self.config.get_current_server()
@@ -548,7 +772,10 @@ class InteractiveMenu:
         for prop, value in status_data:
             status_table.add_row(prop, value)
         
-        self.console.print(Panel(status_table, title="Current Status"))
+        self.console.print(Group(
+            Text.from_markup("[bold blue]📊 Proxy Status[/bold blue]\n"),
+            Panel(status_table, title="Current Status")
+        ))
     
     async def _start_proxy(self):
         """Start the proxy"""
@@ -639,11 +866,11 @@ class InteractiveMenu:
     async def _show_statistics(self):
         """Show statistics"""
         self.console.clear()
-        self.console.print("[bold blue]📊 Usage Statistics[/bold blue]\n")
+        heading = Text.from_markup("[bold blue]📊 Usage Statistics[/bold blue]\n")
         
         try:
             # Get detailed stats
-            stats = await self.stats.get_detailed_stats(24)
+            stats = await self.stats.get_cached_summary(24)
             
             stats_table = Table(show_header=True, box=box.ROUNDED)
             stats_table.add_column("Metric", style="cyan", width=20)
@@ -661,10 +888,10 @@ class InteractiveMenu:
             for metric, value, trend in stats_data:
                 stats_table.add_row(metric, value, trend)
             
-            self.console.print(Panel(stats_table, title="Last 24 Hours"))
+            self.console.print(Group(heading, Panel(stats_table, title="Last 24 Hours")))
             
         except Exception as e:
-            self.console.print(f"[red]Error loading statistics: {e}[/red]")
+            self.console.print(Group(heading, Text(f"Error loading statistics: {e}", style="red")))
     
     async def _show_logs(self):
         """Show logs"""
@@ -678,7 +905,6 @@ class InteractiveMenu:
     async def _configure_settings(self):
         """Configure settings"""
         self.console.clear()
-        self.console.print("[bold blue]⚙️  Configuration[/bold blue]\n")
         
         config_table = Table(show_header=False, box=box.ROUNDED)
         config_table.add_column("Setting", style="cyan", width=20)
@@ -695,12 +921,14 @@ class InteractiveMenu:
         for setting, value in config_data:
             config_table.add_row(setting, value)
         
-        self.console.print(Panel(config_table, title="Current Configuration"))
+        self.console.print(Group(
+            Text.from_markup("[bold blue]⚙️  Configuration[/bold blue]\n"),
+            Panel(config_table, title="Current Configuration")
+        ))
     
     async def _show_servers(self):
         """Show server list with status"""
         self.console.clear()
-        self.console.print("[bold blue]🌐 Server List[/bold blue]\n")
         
         servers = self.config.get_all_servers()
         
@@ -725,14 +953,17 @@ class InteractiveMenu:
                 status
             )
         
-        self.console.print(server_table)
+        self.console.print(Group(
+            Text.from_markup("[bold blue]🌐 Server List[/bold blue]\n"),
+            server_table
+        ))
     
     async def _launch_tui(self):
         """Launch the TUI"""
         self.console.clear()
         self.console.print("[bold blue]🖥️  Launching TUI...[/bold blue]\n")
         
-        tui = ProxyTUI()
+        tui = ProxyTUI(console=self.console)
         await tui.run()
 
 # Convenience function to run the interactive menu
@@ -4,19 +4,46 @@ Utility functions for the Anthropic Proxy CLI
 Common helper functions for formatting, validation, and other operations.
 """
 
+import re
 import time
+from bisect import bisect_right
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
+from rich.text import Text  # already loaded by rich.console
+
+if TYPE_CHECKING:
+    from rich.table import Table
 
 console = Console()
 
+# Patterns and tables used by the validators, built once at import
+_FILENAME_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+_API_KEY_RE = re.compile(r'^[a-zA-Z0-9\-_\.]+$')
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+_TIME_MULTIPLIERS = {
+    'h': 3600,
+    'm': 60,
+    's': 1
+}
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+_TIME_AGO_UNITS = ((86400, 'days'), (3600, 'hours'), (60, 'minutes'))
+
 def format_duration(seconds: float) -> str:
     """Format duration in human-readable format"""
+    # Quantize to millisecond resolution so nearby values share a cache entry
+    return _format_duration(round(seconds, 3))
+
+@lru_cache(maxsize=1024)
+def _format_duration(seconds: float) -> str:
     if seconds < 1:
         return f"{seconds * 1000:.0f}ms"
     elif seconds < 60:
@@ -30,14 +57,16 @@ def format_duration(seconds: float) -> str:
         remaining_minutes = int((seconds % 3600) // 60)
         return f"{hours}h {remaining_minutes}m"
 
+@lru_cache(maxsize=1024)
 def format_bytes(bytes_count: int) -> str:
     """Format bytes in human-readable format"""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_count < 1024.0:
-            return f"{bytes_count:.1f} {unit}"
-        bytes_count /= 1024.0
-    return f"{bytes_count:.1f} PB"
+    if bytes_count < 1024:
+        return f"{bytes_count:.1f} B"
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    exp = min(len(_BYTE_UNITS) - 1, (int(bytes_count).bit_length() - 1) // 10)
+    return f"{bytes_count / (1 << (10 * exp)):.1f} {_BYTE_UNITS[exp]}"
 
+@lru_cache(maxsize=1024, typed=True)
 def format_number(number: Union[int, float]) -> str:
     """Format number with thousands separator"""
     if isinstance(number, int):
@@ -47,22 +76,21 @@ def format_number(number: Union[int, float]) -> str:
 
 def format_timestamp(timestamp: float, format: str = "%Y-%m-%d %H:%M:%S") -> str:
     """Format timestamp to readable string"""
-    dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-    return dt.strftime(format)
+    if "%f" in format or "%Z" in format:
+        # time.strftime has no microseconds directive and names the zone GMT
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime(format)
+    return time.strftime(format, time.gmtime(timestamp))
 
-def format_time_ago(timestamp: float) -> str:
+def format_time_ago(timestamp: float, now: Optional[float] = None) -> str:
     """Format timestamp as 'time ago'"""
-    now = time.time()
+    if now is None:
+        now = time.time()
     diff = now - timestamp
     
-    if diff < 60:
-        return f"{int(diff)} seconds ago"
-    elif diff < 3600:
-        return f"{int(diff // 60)} minutes ago"
-    elif diff < 86400:
-        return f"{int(diff // 3600)} hours ago"
-    else:
-        return f"{int(diff // 86400)} days ago"
+    for seconds, unit in _TIME_AGO_UNITS:
+        if diff >= seconds:
+            return f"{int(diff // seconds)} {unit} ago"
+    return f"{int(diff)} seconds ago"
 
 def truncate_string(text: str, max_length: int = 50, suffix: str = "...") -> str:
     """Truncate string to specified length"""
@@ -72,9 +100,8 @@ def truncate_string(text: str, max_length: int = 50, suffix: str = "...") -> str
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe filesystem usage"""
-    import re
     # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = filename.translate(_FILENAME_TABLE)
     # Remove leading/trailing spaces and dots
     filename = filename.strip(' .')
     # Ensure it's not empty
@@ -93,23 +120,14 @@ def validate_api_key(api_key: str) -> bool:
     
     # Check for common patterns (this is basic validation)
     # API keys are typically alphanumeric with some special characters
-    import re
-    if not re.match(r'^[a-zA-Z0-9\-_\.]+$', api_key):
+    if not _API_KEY_RE.match(api_key):
         return False
     
     return True
 
 def validate_url(url: str) -> bool:
     """Validate URL format"""
-    import re
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    return url_pattern.match(url) is not None
+    return _URL_RE.match(url) is not None
 
 def validate_port(port: Union[str, int]) -> bool:
     """Validate port number"""
@@ -147,6 +165,8 @@ def get_trend_indicator(current: float, previous: float, higher_is_better: bool
 
 def print_banner(console: Console, title: str = "Anthropic Proxy CLI"):
     """Print application banner"""
+    from rich.panel import Panel
+    
     banner_text = Text.from_markup(
         f"[bold blue]🚀 {title}[/bold blue]\n"
         f"[dim]Manage your proxy server and monitor usage statistics[/dim]"
@@ -189,27 +209,19 @@ def confirm_action(console: Console, message: str, default: bool = False) -> boo
 
 def parse_time_string(time_str: str) -> Optional[float]:
     """Parse time string like '1h', '30m', '5s' to seconds"""
-    import re
-    
-    pattern = r'^(\d+)([hms])$'
-    match = re.match(pattern, time_str.strip().lower())
+    time_str = time_str.strip().lower()
+    multiplier = _TIME_MULTIPLIERS.get(time_str[-1:])
+    amount = time_str[:-1]
     
-    if not match:
+    if multiplier is None or not amount.isdecimal():
         return None
     
-    amount, unit = match.groups()
-    amount = int(amount)
-    
-    multipliers = {
-        'h': 3600,
-        'm': 60,
-        's': 1
-    }
-    
-    return amount * multipliers.get(unit, 1)
+    return int(amount) * multiplier
 
-def format_table_data(data: dict, title: str = None) -> Table:
+def format_table_data(data: dict, title: str = None) -> "Table":
     """Format data into a Rich table"""
+    from rich.table import Table
+    
     table = Table(title=title, show_header=True, header_style="bold blue")
     table.add_column("Key", style="cyan", width=20)
     table.add_column("Value", style="white")
@@ -220,8 +232,28 @@ def format_table_data(data: dict, title: str = None) -> Table:
     
     return table
 
+def _format_float(value: float) -> str:
+    if value < 1:
+        return f"{value:.3f}"
+    return format_number(value)
+
+# Formatters for the exact built-in types; subclasses go through the isinstance chain
+_FORMATTERS = {
+    bool: lambda value: "✅ Yes" if value else "❌ No",
+    int: format_number,
+    float: _format_float,
+    list: lambda value: f"[{len(value)} items]",
+    dict: lambda value: f"[{len(value)} keys]",
+    type(None): lambda value: "—",
+    str: str,
+}
+
 def format_value(value) -> str:
     """Format a value for display"""
+    formatter = _FORMATTERS.get(type(value))
+    if formatter is not None:
+        return formatter(value)
+    
     if isinstance(value, bool):
         return "✅ Yes" if value else "❌ No"
     elif isinstance(value, (int, float)):
@@ -252,9 +284,16 @@ def create_progress_tracker(total: int, description: str = "Processing"):
     task_id = progress.add_task(description, total=total)
     return progress, task_id
 
+# Last (second, formatted timestamp) used by safe_filename
+_filename_timestamp = (0, "")
+
 def safe_filename(prefix: str = "", extension: str = "") -> str:
     """Generate a safe filename with timestamp"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    global _filename_timestamp
+    now = int(time.time())
+    if now != _filename_timestamp[0]:
+        _filename_timestamp = (now, time.strftime("%Y%m%d_%H%M%S", time.localtime(now)))
+    timestamp = _filename_timestamp[1]
     
     parts = []
     if prefix:
@@ -271,21 +310,34 @@ def safe_filename(prefix: str = "", extension: str = "") -> str:
     return filename
 
 def calculate_request_rate(timestamps: list, window_seconds: int = 60) -> float:
-    """Calculate request rate from timestamps"""
+    """Calculate request rate from timestamps
+    
+    Timestamps are expected in ascending order (as request logs are appended);
+    a list that is visibly out of order falls back to a linear count.
+    """
     if not timestamps:
         return 0.0
     
     now = time.time()
     cutoff = now - window_seconds
     
-    recent_requests = [ts for ts in timestamps if ts > cutoff]
-    return len(recent_requests) / (window_seconds / 60)  # Requests per minute
+    if timestamps[-1] < timestamps[0]:
+        recent_count = sum(1 for ts in timestamps if ts > cutoff)
+    else:
+        recent_count = len(timestamps) - bisect_right(timestamps, cutoff)
+    return recent_count / (window_seconds / 60)  # Requests per minute
+
+# psutil.Process for this interpreter, created on first use
+_psutil_process = None
 
 def get_memory_usage() -> dict:
     """Get current memory usage statistics"""
+    global _psutil_process
     try:
         import psutil
-        process = psutil.Process()
+        if _psutil_process is None:
+            _psutil_process = psutil.Process()
+        process = _psutil_process
         memory_info = process.memory_info()
         
         return {
@@ -300,6 +352,10 @@ def get_memory_usage() -> dict:
 
 def check_dependencies() -> dict:
     """Check if required dependencies are available"""
+    return dict(_probe_dependencies())
+
+@lru_cache(maxsize=1)
+def _probe_dependencies() -> dict:
     dependencies = {
         "httpx": False,
         "yaml": False,
@@ -317,17 +373,21 @@ def check_dependencies() -> dict:
     
     return dependencies
 
-def get_system_info() -> dict:
-    """Get system information"""
+@lru_cache(maxsize=1)
+def _platform_info() -> dict:
     import platform
     
-    info = {
+    return {
         "platform": platform.platform(),
         "python_version": platform.python_version(),
         "architecture": platform.architecture()[0],
         "processor": platform.processor(),
         "hostname": platform.node()
     }
+
+def get_system_info() -> dict:
+    """Get system information"""
+    info = dict(_platform_info())
     
     # Add memory info if available
     memory_usage = get_memory_usage()
@@ -368,29 +428,47 @@ def merge_dicts(*dicts):
     result = {}
     
     for d in dicts:
-        for key, value in d.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = merge_dicts(result[key], value)
-            else:
-                result[key] = value
+        # Walk nested levels with a worklist of (destination, source) pairs
+        stack = [(result, d)]
+        while stack:
+            dst, src = stack.pop()
+            for key, value in src.items():
+                existing = dst.get(key)
+                if isinstance(existing, dict) and isinstance(value, dict):
+                    # Copy before merging so the input dictionaries are never modified
+                    merged = dst[key] = dict(existing)
+                    stack.append((merged, value))
+                else:
+                    dst[key] = value
     
     return result
 
-def deep_get(dictionary: dict, keys: str, default=None):
-    """Get value from nested dictionary using dot notation"""
-    keys_list = keys.split('.')
+_MISSING = object()
+
+@lru_cache(maxsize=1024)
+def _split_key(keys: str) -> tuple:
+    return tuple(keys.split('.'))
+
+def deep_get(dictionary: dict, keys: Union[str, tuple], default=None):
+    """Get value from nested dictionary using dot notation (or a pre-split tuple of keys)"""
+    keys_list = keys if isinstance(keys, tuple) else _split_key(keys)
     current = dictionary
     
-    try:
-        for key in keys_list:
-            current = current[key]
-        return current
-    except (KeyError, TypeError):
-        return default
-
-def deep_set(dictionary: dict, keys: str, value):
-    """Set value in nested dictionary using dot notation"""
-    keys_list = keys.split('.')
+    for key in keys_list:
+        if isinstance(current, dict):
+            current = current.get(key, _MISSING)
+            if current is _MISSING:
+                return default
+        else:
+            try:
+                current = current[key]
+            except (KeyError, TypeError):
+                return default
+    return current
+
+def deep_set(dictionary: dict, keys: Union[str, tuple], value):
+    """Set value in nested dictionary using dot notation (or a pre-split tuple of keys)"""
+    keys_list = keys if isinstance(keys, tuple) else _split_key(keys)
     current = dictionary
     
     for key in keys_list[:-1]:
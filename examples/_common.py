@@ -0,0 +1,68 @@
+"""
+Helpers shared by the example scripts.
+
+JSON encoding with the optional orjson fast path, HTTP/2 detection, the
+connect budget used by the shared clients, grouped output for examples that
+run concurrently and a raw-bytes SSE line splitter.
+"""
+
+import contextvars
+import json
+from typing import AsyncIterator, Optional
+
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    # Optional; the stdlib encoder is used when orjson is not installed
+    orjson = None
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    # Optional; httpx needs h2 for HTTP/2 and otherwise stays on HTTP/1.1
+    HTTP2_AVAILABLE = False
+
+# A short connect budget lets a down or restarting proxy fail fast and be retried,
+# while reads keep the full budget for model latency
+CONNECT_TIMEOUT = 2.0
+CONNECT_RETRIES = 2
+
+# Output lines of the example running in the current task; None prints directly
+report_lines: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("report_lines", default=None)
+
+def dumps(payload) -> bytes:
+    """Serialize a request payload"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+def loads(content):
+    """Parse a response body, SSE data line or log entry"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def report(text: str = ""):
+    """Print a line, or collect it while examples run concurrently so each example's output stays together"""
+    lines = report_lines.get()
+    if lines is None:
+        print(text)
+    else:
+        lines.append(text)
+
+async def aiter_sse_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+    """Non-empty lines of an SSE response, split as raw bytes so only the lines used get decoded"""
+    pending = b""
+    async for chunk in response.aiter_bytes():
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()  # Incomplete last line, finished by the next chunk
+        for line in lines:
+            line = line.rstrip(b"\r")
+            if line:
+                yield line
+    pending = pending.rstrip(b"\r")
+    if pending:
+        yield pending
@@ -0,0 +1,34 @@
+"""
+Short-lived record of successful proxy health checks.
+
+Lets examples run back to back skip the /health probe when another example
+confirmed the same proxy moments ago.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+
+def _stamp_path(base_url: str) -> str:
+    """Timestamp file for a proxy URL (hashlib, since hash() differs between processes)"""
+    digest = hashlib.sha1(base_url.encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"anthropic_proxy_health_{digest}.ts")
+
+def recently_healthy(base_url: str, ttl: float = 5.0) -> bool:
+    """Whether the proxy at base_url passed a health check within the last ttl seconds"""
+    try:
+        with open(_stamp_path(base_url)) as f:
+            checked_at = float(f.read())
+    except (OSError, ValueError):
+        return False
+    # Wall-clock time, since the stamp is compared across processes
+    return 0 <= time.time() - checked_at < ttl
+
+def mark_healthy(base_url: str) -> None:
+    """Record a successful health check for base_url"""
+    try:
+        with open(_stamp_path(base_url), "w") as f:
+            f.write(str(time.time()))
+    except OSError:
+        pass  # Caching is best effort; the next run just probes again
@@ -0,0 +1,44 @@
+"""
+Tail reader for the proxy's JSON-lines request logs.
+
+Shared by the thinking-parameter examples, so checking the same log twice in
+one process parses its tail only once.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from _common import loads
+
+def tail_lines(path: str, count: int, chunk_size: int = 8192) -> List[bytes]:
+    """Last `count` lines of a file, read backwards from the end so a large log is never loaded whole."""
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        # One newline more than requested guarantees the first kept line is complete
+        while pos > 0 and data.count(b"\n") <= count:
+            read_size = min(chunk_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            data = f.read(read_size) + data
+    return data.splitlines()[-count:]
+
+@lru_cache(maxsize=8)
+def _tail_entries(path: str, size: int, mtime_ns: int, count: int) -> Tuple[Dict[str, Any], ...]:
+    """Parsed tail of a log; size and mtime are part of the key so a changed file is re-read"""
+    entries = []
+    for line in tail_lines(path, count):
+        try:
+            entry = loads(line)
+        except json.JSONDecodeError:
+            continue  # orjson's JSONDecodeError subclasses the stdlib one
+        if isinstance(entry, dict):
+            entries.append(entry)
+    return tuple(entries)
+
+def tail_log(path: str, count: int) -> List[Dict[str, Any]]:
+    """Log entries parsed from the last `count` lines of a JSON-lines log, skipping malformed lines"""
+    stat = os.stat(path)
+    return list(_tail_entries(path, stat.st_size, stat.st_mtime_ns, count))
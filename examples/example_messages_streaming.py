@@ -11,7 +11,8 @@ that occurred when Claude CLI and other clients tried to parse streaming respons
 as JSON.
 """
 
-import requests
+import asyncio
+import httpx
 import json
 import time
 import os
@@ -26,7 +27,9 @@ load_dotenv(project_root / ".env")
 import os
 import sys
 from dotenv import load_dotenv
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+from _common import (CONNECT_RETRIES, CONNECT_TIMEOUT, HTTP2_AVAILABLE, aiter_sse_lines,
+                     dumps, loads, report, report_lines)
 
 # Load environment variables
 load_dotenv()
@@ -40,22 +43,23 @@ if not API_KEY:
     print("Please ensure you have a .env file with SERVER_API_KEY=your_api_key_here")
     sys.exit(1)
 
+# Sent with every request by the shared client
+HEADERS = {
+    "Content-Type": "application/json",
+    "Authorization": f"Bearer {API_KEY}",
+    "x-api-key": API_KEY
+}
+
 def print_separator(title: str):
     """Print a formatted separator"""
-    print(f"\n{'='*60}")
-    print(f"  {title}")
-    print(f"{'='*60}")
+    report(f"\n{'='*60}")
+    report(f"  {title}")
+    report(f"{'='*60}")
 
-def test_non_streaming_request():
+async def test_non_streaming_request(client: httpx.AsyncClient):
     """Test non-streaming /v1/messages request (default behavior)"""
     print_separator("NON-STREAMING /v1/messages REQUEST")
     
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {API_KEY}",
-        "x-api-key": API_KEY
-    }
-    
     payload = {
         "model": "claude-3-sonnet-20240229",
         "max_tokens": 100,
@@ -65,62 +69,56 @@ def test_non_streaming_request():
         # Note: stream=false is the default, so we don't need to specify it
     }
     
-    print(f"🔗 URL: {BASE_URL}/v1/messages")
-    print(f"📦 Payload: {json.dumps(payload, indent=2)}")
-    print(f"📋 Expected: JSON response with Content-Type: application/json")
+    report(f"🔗 URL: {BASE_URL}/v1/messages")
+    report(f"📦 Payload: {json.dumps(payload, indent=2)}")
+    report(f"📋 Expected: JSON response with Content-Type: application/json")
     
     try:
-        start_time = time.time()
-        response = requests.post(f"{BASE_URL}/v1/messages", json=payload, headers=headers)
-        elapsed_time = time.time() - start_time
+        start_time = time.perf_counter()
+        response = await client.post("/v1/messages", content=dumps(payload))
+        elapsed_time = time.perf_counter() - start_time
         
-        print(f"\n📥 Response:")
-        print(f"   Status: {response.status_code}")
-        print(f"   Time: {elapsed_time:.2f}s")
-        print(f"   Content-Type: {response.headers.get('content-type', 'Not specified')}")
-        print(f"   Content-Length: {response.headers.get('content-length', 'Not specified')}")
+        report(f"\n📥 Response:")
+        report(f"   Status: {response.status_code}")
+        report(f"   Time: {elapsed_time:.2f}s")
+        report(f"   Content-Type: {response.headers.get('content-type', 'Not specified')}")
+        report(f"   Content-Length: {response.headers.get('content-length', 'Not specified')}")
         
         if response.status_code == 200:
             try:
-                response_json = response.json()
-                print(f"\n✅ SUCCESS: Received valid JSON response")
-                print(f"📋 Response JSON:")
-                print(json.dumps(response_json, indent=2))
+                response_json = loads(response.content)
+                report(f"\n✅ SUCCESS: Received valid JSON response")
+                report(f"📋 Response JSON:")
+                report(json.dumps(response_json, indent=2))
                 
                 # Check if it's proper Anthropic format
                 if "content" in response_json and "role" in response_json:
-                    print(f"✅ Proper Anthropic format detected")
+                    report(f"✅ Proper Anthropic format detected")
                     if response_json.get("content") and len(response_json["content"]) > 0:
                         content_text = response_json["content"][0].get("text", "")
-                        print(f"💬 Assistant response: {content_text}")
+                        report(f"💬 Assistant response: {content_text}")
                 else:
-                    print(f"⚠️  Unexpected response format")
+                    report(f"⚠️  Unexpected response format")
                     
                 return True
                 
             except json.JSONDecodeError as e:
-                print(f"❌ ERROR: Response is not valid JSON - {e}")
-                print(f"Raw response: {response.text[:500]}...")
+                report(f"❌ ERROR: Response is not valid JSON - {e}")
+                report(f"Raw response: {response.text[:500]}...")
                 return False
         else:
-            print(f"❌ ERROR: HTTP {response.status_code}")
-            print(f"Response: {response.text}")
+            report(f"❌ ERROR: HTTP {response.status_code}")
+            report(f"Response: {response.text}")
             return False
             
-    except requests.exceptions.RequestException as e:
-        print(f"❌ REQUEST FAILED: {e}")
+    except httpx.HTTPError as e:
+        report(f"❌ REQUEST FAILED: {e}")
         return False
 
-def test_explicit_non_streaming_request():
+async def test_explicit_non_streaming_request(client: httpx.AsyncClient):
     """Test non-streaming /v1/messages request with explicit stream=false"""
     print_separator("EXPLICIT NON-STREAMING REQUEST (stream=false)")
     
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {API_KEY}",
-        "x-api-key": API_KEY
-    }
-    
     payload = {
         "model": "claude-3-sonnet-20240229",
         "max_tokens": 100,
@@ -130,55 +128,49 @@ def test_explicit_non_streaming_request():
         "stream": False  # Explicitly set to false
     }
     
-    print(f"🔗 URL: {BASE_URL}/v1/messages")
-    print(f"📦 Payload: {json.dumps(payload, indent=2)}")
-    print(f"📋 Expected: JSON response with Content-Type: application/json")
+    report(f"🔗 URL: {BASE_URL}/v1/messages")
+    report(f"📦 Payload: {json.dumps(payload, indent=2)}")
+    report(f"📋 Expected: JSON response with Content-Type: application/json")
     
     try:
-        start_time = time.time()
-        response = requests.post(f"{BASE_URL}/v1/messages", json=payload, headers=headers)
-        elapsed_time = time.time() - start_time
+        start_time = time.perf_counter()
+        response = await client.post("/v1/messages", content=dumps(payload))
+        elapsed_time = time.perf_counter() - start_time
         
-        print(f"\n📥 Response:")
-        print(f"   Status: {response.status_code}")
-        print(f"   Time: {elapsed_time:.2f}s")
-        print(f"   Content-Type: {response.headers.get('content-type', 'Not specified')}")
+        report(f"\n📥 Response:")
+        report(f"   Status: {response.status_code}")
+        report(f"   Time: {elapsed_time:.2f}s")
+        report(f"   Content-Type: {response.headers.get('content-type', 'Not specified')}")
         
         if response.status_code == 200:
             content_type = response.headers.get('content-type', '')
             if 'application/json' in content_type:
-                print(f"✅ SUCCESS: Received JSON response as expected")
+                report(f"✅ SUCCESS: Received JSON response as expected")
                 try:
-                    response_json = response.json()
-                    print(f"📋 Response JSON:")
-                    print(json.dumps(response_json, indent=2))
+                    response_json = loads(response.content)
+                    report(f"📋 Response JSON:")
+                    report(json.dumps(response_json, indent=2))
                     return True
                 except json.JSONDecodeError as e:
-                    print(f"❌ ERROR: JSON decode failed - {e}")
+                    report(f"❌ ERROR: JSON decode failed - {e}")
                     return False
             else:
-                print(f"❌ ERROR: Expected JSON but got {content_type}")
-                print(f"Response: {response.text[:300]}...")
+                report(f"❌ ERROR: Expected JSON but got {content_type}")
+                report(f"Response: {response.text[:300]}...")
                 return False
         else:
-            print(f"❌ ERROR: HTTP {response.status_code}")
-            print(f"Response: {response.text}")
+            report(f"❌ ERROR: HTTP {response.status_code}")
+            report(f"Response: {response.text}")
             return False
             
-    except requests.exceptions.RequestException as e:
-        print(f"❌ REQUEST FAILED: {e}")
+    except httpx.HTTPError as e:
+        report(f"❌ REQUEST FAILED: {e}")
         return False
 
-def test_streaming_request():
+async def test_streaming_request(client: httpx.AsyncClient):
     """Test streaming /v1/messages request"""
     print_separator("STREAMING /v1/messages REQUEST (stream=true)")
     
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {API_KEY}",
-        "x-api-key": API_KEY
-    }
-    
     payload = {
         "model": "claude-3-sonnet-20240229",
         "max_tokens": 150,
@@ -188,77 +180,79 @@ def test_streaming_request():
         "stream": True  # Enable streaming
     }
     
-    print(f"🔗 URL: {BASE_URL}/v1/messages")
-    print(f"📦 Payload: {json.dumps(payload, indent=2)}")
-    print(f"📋 Expected: SSE stream with Content-Type: text/event-stream")
+    report(f"🔗 URL: {BASE_URL}/v1/messages")
+    report(f"📦 Payload: {json.dumps(payload, indent=2)}")
+    report(f"📋 Expected: SSE stream with Content-Type: text/event-stream")
     
     try:
-        start_time = time.time()
-        response = requests.post(f"{BASE_URL}/v1/messages", json=payload, headers=headers, stream=True)
+        start_time = time.perf_counter()
+        # Compressed SSE would be buffered by the decoder; keep events flowing as sent
+        async with client.stream(
+            "POST",
+            "/v1/messages",
+            content=dumps(payload),
+            headers={"Accept-Encoding": "identity"}
+        ) as response:
+            report(f"\n📥 Response:")
+            report(f"   Status: {response.status_code}")
+            report(f"   Content-Type: {response.headers.get('content-type', 'Not specified')}")
         
-        print(f"\n📥 Response:")
-        print(f"   Status: {response.status_code}")
-        print(f"   Content-Type: {response.headers.get('content-type', 'Not specified')}")
-        
-        if response.status_code == 200:
-            content_type = response.headers.get('content-type', '')
-            if 'text/event-stream' in content_type:
-                print(f"✅ SUCCESS: Received streaming response as expected")
-                print(f"\n📡 Streaming content:")
+            if response.status_code == 200:
+                content_type = response.headers.get('content-type', '')
+                if 'text/event-stream' in content_type:
+                    report(f"✅ SUCCESS: Received streaming response as expected")
+                    report(f"\n📡 Streaming content:")
                 
-                chunk_count = 0
-                total_content = ""
+                    chunk_count = 0
+                    content_parts = []
                 
-                for line in response.iter_lines(decode_unicode=True):
-                    if line:
-                        print(f"   {line}")
-                        
-                        # Parse SSE data
-                        if line.startswith("data: "):
+                    async for line in aiter_sse_lines(response):
+                        report(f"   {line.decode('utf-8', 'replace')}")
+
+                        # Parse SSE data straight from bytes; only "data: " lines carry
+                        # chunks, so event:, id: and ":" keepalive lines fall through on
+                        # the first-byte check
+                        if line[:1] == b"d" and line[:6] == b"data: ":
                             chunk_count += 1
                             data_content = line[6:]  # Remove "data: " prefix
-                            if data_content.strip() and data_content != "[DONE]":
+                            if data_content.strip() and data_content != b"[DONE]":
                                 try:
-                                    chunk_json = json.loads(data_content)
+                                    chunk_json = loads(data_content)
                                     if chunk_json.get("type") == "content_block_delta":
-                                        delta_text = chunk_json.get("delta", {}).get("text", "")
-                                        total_content += delta_text
+                                        content_parts.append(chunk_json.get("delta", {}).get("text", ""))
                                 except json.JSONDecodeError:
                                     pass  # Ignore malformed JSON in stream
                 
-                elapsed_time = time.time() - start_time
-                print(f"\n✅ Streaming completed in {elapsed_time:.2f}s")
-                print(f"📊 Received {chunk_count} chunks")
-                if total_content:
-                    print(f"💬 Reconstructed content: {total_content}")
-                return True
+                    total_content = "".join(content_parts)
+                    elapsed_time = time.perf_counter() - start_time
+                    report(f"\n✅ Streaming completed in {elapsed_time:.2f}s")
+                    report(f"📊 Received {chunk_count} chunks")
+                    if total_content:
+                        report(f"💬 Reconstructed content: {total_content}")
+                    return True
                 
+                else:
+                    report(f"❌ ERROR: Expected SSE stream but got {content_type}")
+                    await response.aread()
+                    report(f"Response: {response.text[:300]}...")
+                    return False
             else:
-                print(f"❌ ERROR: Expected SSE stream but got {content_type}")
-                print(f"Response: {response.text[:300]}...")
+                report(f"❌ ERROR: HTTP {response.status_code}")
+                await response.aread()
+                report(f"Response: {response.text}")
                 return False
-        else:
-            print(f"❌ ERROR: HTTP {response.status_code}")
-            print(f"Response: {response.text}")
-            return False
             
-    except requests.exceptions.RequestException as e:
-        print(f"❌ REQUEST FAILED: {e}")
+    except httpx.HTTPError as e:
+        report(f"❌ REQUEST FAILED: {e}")
         return False
 
-def test_claude_cli_compatibility():
+async def test_claude_cli_compatibility(client: httpx.AsyncClient):
     """Test the exact request pattern that Claude CLI uses"""
     print_separator("CLAUDE CLI COMPATIBILITY TEST")
     
-    print(f"📋 This test simulates the exact request pattern that Claude CLI uses.")
-    print(f"📋 Before the fix, this would cause 'Cannot read properties of undefined (reading map)' error.")
-    print(f"📋 After the fix, this should return proper JSON that Claude CLI can parse.")
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {API_KEY}",
-        "x-api-key": API_KEY
-    }
+    report(f"📋 This test simulates the exact request pattern that Claude CLI uses.")
+    report(f"📋 Before the fix, this would cause 'Cannot read properties of undefined (reading map)' error.")
+    report(f"📋 After the fix, this should return proper JSON that Claude CLI can parse.")
     
     # This mimics exactly what Claude CLI sends
     payload = {
@@ -270,54 +264,82 @@ def test_claude_cli_compatibility():
         # Note: Claude CLI doesn't send stream parameter, expects JSON response
     }
     
-    print(f"🔗 URL: {BASE_URL}/v1/messages")
-    print(f"📦 Payload (Claude CLI pattern): {json.dumps(payload, indent=2)}")
+    report(f"🔗 URL: {BASE_URL}/v1/messages")
+    report(f"📦 Payload (Claude CLI pattern): {json.dumps(payload, indent=2)}")
     
     try:
-        response = requests.post(f"{BASE_URL}/v1/messages", json=payload, headers=headers)
+        response = await client.post("/v1/messages", content=dumps(payload))
         
-        print(f"\n📥 Response:")
-        print(f"   Status: {response.status_code}")
-        print(f"   Content-Type: {response.headers.get('content-type', 'Not specified')}")
+        report(f"\n📥 Response:")
+        report(f"   Status: {response.status_code}")
+        report(f"   Content-Type: {response.headers.get('content-type', 'Not specified')}")
         
         if response.status_code == 200:
             content_type = response.headers.get('content-type', '')
             
             # Check if we get JSON (what Claude CLI expects)
             if 'application/json' in content_type:
-                print(f"✅ SUCCESS: Claude CLI compatible - JSON response received")
+                report(f"✅ SUCCESS: Claude CLI compatible - JSON response received")
                 try:
-                    response_json = response.json()
+                    response_json = loads(response.content)
                     
                     # Verify it has the structure Claude CLI expects
                     if "content" in response_json and isinstance(response_json["content"], list):
-                        print(f"✅ Response structure is compatible with Claude CLI")
-                        print(f"📋 Response preview:")
-                        print(json.dumps(response_json, indent=2))
+                        report(f"✅ Response structure is compatible with Claude CLI")
+                        report(f"📋 Response preview:")
+                        report(json.dumps(response_json, indent=2))
                         return True
                     else:
-                        print(f"⚠️  Response structure might not be fully compatible")
+                        report(f"⚠️  Response structure might not be fully compatible")
                         return False
                         
                 except json.JSONDecodeError as e:
-                    print(f"❌ ERROR: JSON decode failed - {e}")
+                    report(f"❌ ERROR: JSON decode failed - {e}")
                     return False
                     
             elif 'text/event-stream' in content_type:
-                print(f"❌ ERROR: Claude CLI incompatible - received streaming response instead of JSON")
-                print(f"📋 This would cause the 'map()' error in Claude CLI")
+                report(f"❌ ERROR: Claude CLI incompatible - received streaming response instead of JSON")
+                report(f"📋 This would cause the 'map()' error in Claude CLI")
                 return False
             else:
-                print(f"❌ ERROR: Unexpected content type: {content_type}")
+                report(f"❌ ERROR: Unexpected content type: {content_type}")
                 return False
         else:
-            print(f"❌ ERROR: HTTP {response.status_code}")
+            report(f"❌ ERROR: HTTP {response.status_code}")
             return False
             
-    except requests.exceptions.RequestException as e:
-        print(f"❌ REQUEST FAILED: {e}")
+    except httpx.HTTPError as e:
+        report(f"❌ REQUEST FAILED: {e}")
         return False
 
+async def run_tests() -> Dict[str, bool]:
+    """Run the independent tests concurrently over one client, then print their output in order"""
+    tests = {
+        "non_streaming_default": test_non_streaming_request,
+        "non_streaming_explicit": test_explicit_non_streaming_request,
+        "streaming": test_streaming_request,
+        "claude_cli_compatibility": test_claude_cli_compatibility
+    }
+    
+    async def run(test, client: httpx.AsyncClient) -> Tuple[bool, list]:
+        lines = []
+        report_lines.set(lines)  # Each task has its own context, so this stays local
+        return await test(client), lines
+    
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        headers=HEADERS,
+        timeout=httpx.Timeout(30.0, connect=CONNECT_TIMEOUT),
+        transport=httpx.AsyncHTTPTransport(retries=CONNECT_RETRIES, http2=HTTP2_AVAILABLE)
+    ) as client:
+        outcomes = await asyncio.gather(*(run(test, client) for test in tests.values()))
+    
+    results = {}
+    for name, (passed, lines) in zip(tests, outcomes):
+        print("\n".join(lines))
+        results[name] = passed
+    return results
+
 def main():
     """Run all tests"""
     print("🧪 TESTING /v1/messages ENDPOINT - STREAMING VS NON-STREAMING")
@@ -326,39 +348,19 @@ def main():
     print("that occurred when clients expected JSON responses but received streaming responses.")
     print("="*80)
     
-    results = {
-        "non_streaming_default": False,
-        "non_streaming_explicit": False,
-        "streaming": False,
-        "claude_cli_compatibility": False
-    }
-    
-    # Test non-streaming (default)
-    results["non_streaming_default"] = test_non_streaming_request()
-    
-    time.sleep(1)  # Brief pause between tests
-    
-    # Test non-streaming (explicit)
-    results["non_streaming_explicit"] = test_explicit_non_streaming_request()
-    
-    time.sleep(1)  # Brief pause between tests
-    
-    # Test streaming
-    results["streaming"] = test_streaming_request()
-    
-    time.sleep(1)  # Brief pause between tests
-    
-    # Test Claude CLI compatibility
-    results["claude_cli_compatibility"] = test_claude_cli_compatibility()
+    results = asyncio.run(run_tests())
     
     # Summary
     print_separator("TEST RESULTS SUMMARY")
     
+    failed_tests = []
     for test_name, passed in results.items():
         status = "✅ PASSED" if passed else "❌ FAILED"
         print(f"{test_name:30} {status}")
+        if not passed:
+            failed_tests.append(test_name)
     
-    all_passed = all(results.values())
+    all_passed = not failed_tests
     
     if all_passed:
         print(f"\n🎉 ALL TESTS PASSED!")
@@ -366,7 +368,6 @@ def main():
         print(f"✅ Claude CLI compatibility is restored - no more 'map()' errors")
         print(f"✅ Both Anthropic format responses and SSE streaming work as expected")
     else:
-        failed_tests = [name for name, passed in results.items() if not passed]
         print(f"\n❌ SOME TESTS FAILED: {', '.join(failed_tests)}")
         print(f"Please check the proxy configuration and server status")
     
@@ -6,14 +6,13 @@ Shows how different model names route to different endpoints.
 
 import asyncio
 import httpx
-import json
 import os
-import requests
 import sys
 import time
 from pathlib import Path
 from dotenv import load_dotenv
 from typing import Dict, Any
+from _common import loads
 
 # Add project root to path and load environment from project root
 project_root = Path(__file__).parent.parent
@@ -29,7 +28,23 @@ if not API_KEY:
     print("Please ensure your .env file contains: SERVER_API_KEY=your_api_key_here")
     exit(1)
 
-def make_request(model: str, content: str, description: str) -> Dict[str, Any]:
+HEADERS = {
+    "Content-Type": "application/json",
+    "Authorization": f"Bearer {API_KEY}",
+    "x-api-key": API_KEY
+}
+
+USAGE_NOTES = f"""
+{'='*80}
+💡 USAGE NOTES
+{'='*80}
+• Use 'glm-4.6' for automatic smart routing based on content
+• Use 'glm-4.6-openai' to force requests to OpenAI endpoint
+• Use 'glm-4.6-anthropic' to force text requests to Anthropic endpoint
+• Image requests with '-anthropic' suffix still route to OpenAI (required)
+• Configure TEXT_ENDPOINT_PREFERENCE in .env for global preferences"""
+
+async def make_request(model: str, content: str, description: str, client: httpx.AsyncClient) -> Dict[str, Any]:
     """Make a request to the proxy and return results with timing"""
     print(f"\n{'='*60}")
     print(f"🧪 {description}")
@@ -37,7 +52,7 @@ def make_request(model: str, content: str, description: str) -> Dict[str, Any]:
     print(f"Model: {model}")
     print(f"Content: {content}")
     
-    url = f"{API_BASE}/v1/chat/completions"
+    url = "/v1/chat/completions"
     payload = {
         "model": model,
         "messages": [{"role": "user", "content": content}],
@@ -45,24 +60,18 @@ def make_request(model: str, content: str, description: str) -> Dict[str, Any]:
         "stream": False
     }
     
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {API_KEY}",
-        "x-api-key": API_KEY
-    }
-    
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         print(f"📤 Sending request...")
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
-        response_time = time.time() - start_time
+        response = await client.post(url, json=payload)
+        response_time = time.perf_counter() - start_time
         
         print(f"📥 Response received in {response_time:.2f}s")
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
+            data = loads(response.content)
             print(f"✅ SUCCESS")
             print(f"Response Model: {data.get('model', 'Unknown')}")
             print(f"Response: {data['choices'][0]['message']['content'][:100]}...")
@@ -73,12 +82,12 @@ def make_request(model: str, content: str, description: str) -> Dict[str, Any]:
             return {"success": False, "error": response.text, "time": response_time}
             
     except Exception as e:
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
         print(f"💥 EXCEPTION after {response_time:.2f}s")
         print(f"Error: {str(e)}")
         return {"success": False, "error": str(e), "time": response_time}
 
-def demonstrate_endpoint_preferences():
+async def demonstrate_endpoint_preferences():
     """Demonstrate the new endpoint preference functionality"""
     
     print("🌟 ANTHROPIC PROXY - MODEL VARIANT DEMONSTRATION")
@@ -110,20 +119,28 @@ def demonstrate_endpoint_preferences():
     
     results = []
     
-    for test_case in test_cases:
-        result = make_request(
-            model=test_case["model"],
-            content=test_message,
-            description=test_case["description"]
-        )
-        
-        result.update({
-            "model": test_case["model"],
-            "expected": test_case["expected"]
-        })
-        results.append(result)
-        
-        time.sleep(1)  # Rate limiting
+    # One client for every variant, so requests after the first reuse its connection
+    async with httpx.AsyncClient(
+        base_url=API_BASE,
+        headers=HEADERS,
+        timeout=30,
+        limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+    ) as client:
+        for test_case in test_cases:
+            result = await make_request(
+                model=test_case["model"],
+                content=test_message,
+                description=test_case["description"],
+                client=client
+            )
+            
+            result.update({
+                "model": test_case["model"],
+                "expected": test_case["expected"]
+            })
+            results.append(result)
+            
+            await asyncio.sleep(1)  # Rate limiting
     
     # Summary
     print(f"\n{'='*80}")
@@ -144,14 +161,7 @@ def demonstrate_endpoint_preferences():
     else:
         print("⚠️  Some tests failed. Check API keys and service availability.")
     
-    print(f"\n{'='*80}")
-    print("💡 USAGE NOTES")
-    print(f"{'='*80}")
-    print("• Use 'glm-4.6' for automatic smart routing based on content")
-    print("• Use 'glm-4.6-openai' to force requests to OpenAI endpoint")
-    print("• Use 'glm-4.6-anthropic' to force text requests to Anthropic endpoint")
-    print("• Image requests with '-anthropic' suffix still route to OpenAI (required)")
-    print("• Configure TEXT_ENDPOINT_PREFERENCE in .env for global preferences")
+    print(USAGE_NOTES)
 
 def main():
     """Main function"""
@@ -159,7 +169,7 @@ def main():
     
     # Check if service is running
     try:
-        response = requests.get(f"{API_BASE}/v1/models", timeout=5)
+        response = httpx.get(f"{API_BASE}/v1/models", timeout=5)
         if response.status_code != 200:
             print(f"❌ Service not available at {API_BASE}")
             print("Please ensure the proxy is running: python main.py")
@@ -170,7 +180,7 @@ def main():
         print("Please ensure the proxy is running: python main.py")
         return
     
-    demonstrate_endpoint_preferences()
+    asyncio.run(demonstrate_endpoint_preferences())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
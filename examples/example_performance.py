@@ -6,13 +6,15 @@ Shows the proxy's performance advantage over direct API calls.
 
 import asyncio
 import httpx
-import json
+import math
 import os
-import requests
 import sys
 import time
 from pathlib import Path
+from typing import List, Optional
 from dotenv import load_dotenv
+from _common import HTTP2_AVAILABLE, dumps
+from _health_cache import mark_healthy, recently_healthy
 
 # Add project root to path and load environment from project root
 project_root = Path(__file__).parent.parent
@@ -29,27 +31,100 @@ if not API_KEY:
     print("Please ensure your .env file contains: SERVER_API_KEY=your_api_key_here")
     exit(1)
 
-def benchmark_request(url: str, headers: dict, payload: dict, description: str) -> float:
+# Connection pool for each benchmarked host; kept alive across samples so every
+# measurement after the first excludes the TCP/TLS handshake
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+def make_client(base_url: str, http2: bool = False) -> httpx.AsyncClient:
+    """Long-lived pooled client for one benchmarked host"""
+    return httpx.AsyncClient(
+        base_url=base_url, limits=POOL_LIMITS, timeout=30.0, http2=http2
+    )
+
+async def benchmark_request(
+    client: httpx.AsyncClient, url: str, headers: dict, body: bytes, description: str
+) -> Optional[float]:
     """Benchmark a single request and return response time"""
     print(f"📤 {description}...")
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
-        response_time = time.time() - start_time
+        response = await client.post(url, content=body, headers=headers)
+        response_time = time.perf_counter() - start_time
 
         if response.status_code == 200:
-            print(".2f"            return response_time
+            print(f"✅ {description} completed in {response_time:.2f}s")
+            return response_time
         else:
             print(f"❌ Failed: {response.status_code}")
             return None
     except Exception as e:
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
         print(f"💥 Error after {response_time:.2f}s: {e}")
         return None
 
-def run_performance_comparison():
-    """Run comprehensive performance comparison"""
+async def benchmark_concurrent(
+    client: httpx.AsyncClient, url: str, headers: dict, body: bytes, description: str, count: int
+) -> List[float]:
+    """Send `count` requests at once and return the response times of the successful ones"""
+    start_time = time.perf_counter()
+    times = await asyncio.gather(*(
+        benchmark_request(client, url, headers, body, f"{description} {i+1}/{count}")
+        for i in range(count)
+    ))
+    elapsed = time.perf_counter() - start_time
+    times = [t for t in times if t]
+    print(f"⏱️  {description}: {len(times)}/{count} succeeded in {elapsed:.2f}s "
+          f"({len(times) / elapsed:.2f} req/s)")
+    return times
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * pct / 100) - 1)]
+
+async def run_batched(
+    client: httpx.AsyncClient, url: str, headers: dict, body: bytes, description: str,
+    total: int = 50, batch_size: int = 5, delay: float = 0.5
+) -> List[float]:
+    """Send `total` requests in concurrent batches of `batch_size`, pausing `delay` seconds between batches"""
+    async def timed_post() -> Optional[float]:
+        start_time = time.perf_counter()
+        try:
+            response = await client.post(url, content=body, headers=headers)
+        except httpx.HTTPError:
+            return None
+        return time.perf_counter() - start_time if response.status_code == 200 else None
+
+    print(f"📤 {description}: {total} requests in batches of up to {batch_size}...")
+    times = []
+    sent = 0
+    start_time = time.perf_counter()
+    while sent < total:
+        # Pause between batches only, so no idle time is timed after the last one
+        if sent:
+            await asyncio.sleep(delay)
+        size = min(batch_size, total - sent)
+        batch = await asyncio.gather(*(timed_post() for _ in range(size)))
+        times.extend(t for t in batch if t)
+        sent += size
+    elapsed = time.perf_counter() - start_time
+
+    if times:
+        print(f"⏱️  {description}: {len(times)}/{sent} succeeded, "
+              f"p50 {percentile(times, 50):.2f}s, p95 {percentile(times, 95):.2f}s, "
+              f"{len(times) / elapsed:.2f} req/s")
+    else:
+        print(f"❌ {description}: no successful requests")
+    return times
+
+async def run_performance_comparison(concurrent: int = 0, batch_size: int = 0, total: int = 50):
+    """Run comprehensive performance comparison
+
+    With `concurrent` set, each side sends that many requests at once to measure
+    sustained throughput instead of sequential latency. With `batch_size` set, each
+    side sends `total` requests in paced concurrent batches and reports p50/p95.
+    """
 
     print("🚀 ANTHROPIC PROXY - PERFORMANCE DEMONSTRATION")
     print("=" * 80)
@@ -61,7 +136,7 @@ def run_performance_comparison():
     test_message = "Write a short haiku about artificial intelligence and creativity."
 
     # Proxy request configuration
-    proxy_url = f"{PROXY_BASE}/v1/chat/completions"
+    proxy_url = "/v1/chat/completions"
     proxy_payload = {
         "model": "glm-4.5",
         "messages": [{"role": "user", "content": test_message}],
@@ -75,7 +150,7 @@ def run_performance_comparison():
     }
 
     # Direct API request configuration
-    direct_url = f"{DIRECT_BASE}/messages"
+    direct_url = "/messages"
     direct_payload = {
         "model": "glm-4-5",
         "messages": [{"role": "user", "content": test_message}],
@@ -88,37 +163,68 @@ def run_performance_comparison():
         "anthropic-version": "2023-06-01"
     }
 
+    # Serialized once so the timed requests don't re-encode the same payloads
+    proxy_body = dumps(proxy_payload)
+    direct_body = dumps(direct_payload)
+
     # Run multiple tests for statistical significance
     num_tests = 5
     proxy_times = []
     direct_times = []
 
-    print(f"\n🧪 Running {num_tests} performance tests...")
-    print("-" * 50)
+    # HTTP/2 is negotiated through TLS ALPN, so only the HTTPS direct API can multiplex
+    # concurrent requests over one connection; the plain-HTTP proxy stays on HTTP/1.1
+    async with make_client(PROXY_BASE) as proxy_client, \
+            make_client(DIRECT_BASE, http2=HTTP2_AVAILABLE) as direct_client:
+        if batch_size:
+            print(f"\n🧪 Running {total} requests per side in batches of {batch_size}...")
+            print("-" * 50)
 
-    for i in range(num_tests):
-        print(f"\nTest {i+1}/{num_tests}:")
+            proxy_times = await run_batched(
+                proxy_client, proxy_url, proxy_headers, proxy_body,
+                "Proxy requests", total, batch_size
+            )
+            direct_times = await run_batched(
+                direct_client, direct_url, direct_headers, direct_body,
+                "Direct API requests", total, batch_size
+            )
+        elif concurrent:
+            print(f"\n🧪 Running {concurrent} concurrent requests per side...")
+            print("-" * 50)
 
-        # Test proxy
-        proxy_time = benchmark_request(
-            proxy_url, proxy_headers, proxy_payload,
-            "Proxy request"
-        )
-        if proxy_time:
-            proxy_times.append(proxy_time)
+            proxy_times = await benchmark_concurrent(
+                proxy_client, proxy_url, proxy_headers, proxy_body,
+                "Proxy requests", concurrent
+            )
+            direct_times = await benchmark_concurrent(
+                direct_client, direct_url, direct_headers, direct_body,
+                "Direct API requests", concurrent
+            )
+        else:
+            print(f"\n🧪 Running {num_tests} performance tests...")
+            print("-" * 50)
 
-        # Small delay between requests
-        time.sleep(0.5)
+            for i in range(num_tests):
+                print(f"\nTest {i+1}/{num_tests}:")
 
-        # Test direct API
-        direct_time = benchmark_request(
-            direct_url, direct_headers, direct_payload,
-            "Direct API request"
-        )
-        if direct_time:
-            direct_times.append(direct_time)
+                # Test proxy and direct API side by side, so both are measured
+                # under the same network conditions
+                proxy_time, direct_time = await asyncio.gather(
+                    benchmark_request(
+                        proxy_client, proxy_url, proxy_headers, proxy_body,
+                        "Proxy request"
+                    ),
+                    benchmark_request(
+                        direct_client, direct_url, direct_headers, direct_body,
+                        "Direct API request"
+                    )
+                )
+                if proxy_time:
+                    proxy_times.append(proxy_time)
+                if direct_time:
+                    direct_times.append(direct_time)
 
-        time.sleep(1)  # Rate limiting
+                await asyncio.sleep(1)  # Rate limiting
 
     # Calculate results
     if proxy_times and direct_times:
@@ -141,6 +247,7 @@ def run_performance_comparison():
         print(f"\n📋 Test Details:")
         print(f"   • {len(proxy_times)} proxy requests successful")
         print(f"   • {len(direct_times)} direct API requests successful")
+        print(f"   • Direct API protocol: {'HTTP/2' if HTTP2_AVAILABLE else 'HTTP/1.1 (install h2 for HTTP/2)'}")
         print(f"   • Model: glm-4.5 (auto-routing to Anthropic)")
         print(f"   • Message length: {len(test_message)} characters")
 
@@ -156,22 +263,35 @@ def run_performance_comparison():
 
 def main():
     """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Proxy vs direct API performance demonstration")
+    parser.add_argument("--concurrent", type=int, default=0, metavar="N",
+                        help="Send N requests at once per side instead of sequential samples")
+    parser.add_argument("--batch-size", type=int, default=0, metavar="N",
+                        help="Send requests in paced concurrent batches of N and report p50/p95 latency")
+    parser.add_argument("--total", type=int, default=50,
+                        help="Requests per side in batched mode")
+    args = parser.parse_args()
+
     print("Starting performance demonstration...")
 
-    # Check if proxy is running
-    try:
-        response = requests.get(f"{PROXY_BASE}/health", timeout=5)
-        if response.status_code != 200:
-            print(f"❌ Proxy not available at {PROXY_BASE}")
+    # Check if proxy is running, unless another example just did
+    if not recently_healthy(PROXY_BASE):
+        try:
+            response = httpx.get(f"{PROXY_BASE}/health", timeout=5)
+            if response.status_code != 200:
+                print(f"❌ Proxy not available at {PROXY_BASE}")
+                print("Please ensure the proxy is running: docker compose up -d")
+                return
+        except Exception as e:
+            print(f"❌ Cannot connect to proxy at {PROXY_BASE}")
+            print(f"Error: {e}")
             print("Please ensure the proxy is running: docker compose up -d")
             return
-    except Exception as e:
-        print(f"❌ Cannot connect to proxy at {PROXY_BASE}")
-        print(f"Error: {e}")
-        print("Please ensure the proxy is running: docker compose up -d")
-        return
+        mark_healthy(PROXY_BASE)
 
-    run_performance_comparison()
+    asyncio.run(run_performance_comparison(args.concurrent, args.batch_size, args.total))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
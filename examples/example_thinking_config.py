@@ -14,11 +14,12 @@ Usage:
 3. Run this script: python example_thinking_config.py
 """
 
+import asyncio
 import os
-import json
-import time
 from dotenv import load_dotenv
-import requests
+import httpx
+from _health_cache import mark_healthy, recently_healthy
+from _log_tail import tail_log
 
 # Load environment variables
 load_dotenv()
@@ -35,7 +36,7 @@ HEADERS = {
     "x-api-key": API_KEY
 }
 
-def test_endpoint_routing():
+async def test_endpoint_routing():
     """Test different model variants to verify thinking parameter behavior."""
     
     print("🔍 Testing Thinking Parameter Configuration")
@@ -48,24 +49,29 @@ def test_endpoint_routing():
         ("glm-4.5-anthropic", "Force Anthropic routing", "anthropic", False),
     ]
     
+    # The variants are independent, so they are sent together over one client and
+    # reported in order; the proxy's log timestamps keep the upstream entries ordered
+    async with httpx.AsyncClient(base_url=BASE_URL, headers=HEADERS, timeout=30) as client:
+        responses = await asyncio.gather(*(
+            client.post("/v1/chat/completions", json={
+                "model": model,
+                "messages": [{"role": "user", "content": "Hello, this is a test message."}],
+                "max_tokens": 50
+            })
+            for model, *_ in test_cases
+        ), return_exceptions=True)
+    
     results = []
     
-    for model, description, expected_endpoint, should_have_thinking in test_cases:
+    for (model, description, expected_endpoint, should_have_thinking), response in zip(test_cases, responses):
         print(f"\n📝 Testing: {model}")
         print(f"   Description: {description}")
         print(f"   Expected endpoint: {expected_endpoint}")
         print(f"   Should have thinking parameter: {should_have_thinking}")
         
-        payload = {
-            "model": model,
-            "messages": [{"role": "user", "content": "Hello, this is a test message."}],
-            "max_tokens": 50
-        }
-        
         try:
-            response = requests.post(f"{BASE_URL}/v1/chat/completions", 
-                                   json=payload, 
-                                   headers=HEADERS)
+            if isinstance(response, Exception):
+                raise response
             
             if response.status_code == 200:
                 result = response.json()
@@ -102,8 +108,9 @@ def test_endpoint_routing():
                 "success": False,
                 "error": str(e)
             })
-        
-        time.sleep(1)  # Small delay for log ordering
+    
+    # Let the proxy flush logs/upstream_requests.json before it is checked
+    await asyncio.sleep(2)
     
     return results
 
@@ -118,16 +125,13 @@ def check_log_evidence():
         return False
     
     try:
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
-            recent_lines = lines[-10:]  # Check last 10 entries
+        recent_entries = tail_log(log_file, 10)  # Check last 10 entries
             
         openai_with_thinking = 0
         anthropic_without_thinking = 0
         
-        for line in recent_lines:
+        for log_entry in recent_entries:
             try:
-                log_entry = json.loads(line.strip())
                 endpoint_type = log_entry.get("endpoint_type", "")
                 payload = log_entry.get("payload", {})
                 
@@ -143,7 +147,7 @@ def check_log_evidence():
                     anthropic_without_thinking += 1
                     print(f"   ✅ Found Anthropic request without thinking (correct)")
                     
-            except (json.JSONDecodeError, KeyError):
+            except KeyError:
                 continue
         
         print(f"\n📊 Log Analysis Results:")
@@ -156,46 +160,51 @@ def check_log_evidence():
         print(f"❌ Error reading log file: {e}")
         return False
 
+CONFIGURATION_HELP = """
+💡 Configuration Help
+=========================
+1. Environment Variable: ENABLE_ZAI_THINKING
+   • Default: true
+   • Controls automatic thinking parameter injection
+   • Only affects OpenAI endpoint requests
+
+2. When ENABLE_ZAI_THINKING=true:
+   • OpenAI requests get: {"thinking": {"type": "enabled"}}
+   • Anthropic requests: no thinking parameter added
+
+3. Model Routing:
+   • glm-4.5 (text) → Anthropic endpoint → no thinking
+   • glm-4.5 (images) → OpenAI endpoint → thinking added
+   • glm-4.5-openai → OpenAI endpoint → thinking added
+   • glm-4.5-anthropic → Anthropic endpoint → no thinking
+
+4. To Disable Thinking Parameter:
+   • Set ENABLE_ZAI_THINKING=false in .env
+   • Restart proxy: docker compose restart
+
+5. Verification:
+   • Check logs/upstream_requests.json for full payloads
+   • OpenAI requests should include thinking parameter
+   • Anthropic requests should NOT include thinking parameter"""
+
 def print_configuration_help():
     """Print help information about thinking parameter configuration."""
-    print(f"\n💡 Configuration Help")
-    print("=" * 25)
-    print("1. Environment Variable: ENABLE_ZAI_THINKING")
-    print("   • Default: true")
-    print("   • Controls automatic thinking parameter injection")
-    print("   • Only affects OpenAI endpoint requests")
-    print("")
-    print("2. When ENABLE_ZAI_THINKING=true:")
-    print("   • OpenAI requests get: {\"thinking\": {\"type\": \"enabled\"}}")
-    print("   • Anthropic requests: no thinking parameter added")
-    print("")
-    print("3. Model Routing:")
-    print("   • glm-4.5 (text) → Anthropic endpoint → no thinking")
-    print("   • glm-4.5 (images) → OpenAI endpoint → thinking added")
-    print("   • glm-4.5-openai → OpenAI endpoint → thinking added")
-    print("   • glm-4.5-anthropic → Anthropic endpoint → no thinking")
-    print("")
-    print("4. To Disable Thinking Parameter:")
-    print("   • Set ENABLE_ZAI_THINKING=false in .env")
-    print("   • Restart proxy: docker compose restart")
-    print("")
-    print("5. Verification:")
-    print("   • Check logs/upstream_requests.json for full payloads")
-    print("   • OpenAI requests should include thinking parameter")
-    print("   • Anthropic requests should NOT include thinking parameter")
+    print(CONFIGURATION_HELP)
 
 def main():
     """Run the configuration test."""
     
-    # Check proxy health first
-    try:
-        health = requests.get(f"{BASE_URL}/health")
-        if health.status_code != 200:
-            print("❌ Proxy is not healthy")
+    # Check proxy health first, unless another example just did
+    if not recently_healthy(BASE_URL):
+        try:
+            health = httpx.get(f"{BASE_URL}/health")
+            if health.status_code != 200:
+                print("❌ Proxy is not healthy")
+                return
+        except:
+            print("❌ Cannot connect to proxy. Is it running?")
             return
-    except:
-        print("❌ Cannot connect to proxy. Is it running?")
-        return
+        mark_healthy(BASE_URL)
     
     print("🧠 z.ai Thinking Parameter Configuration Test")
     print("=" * 50)
@@ -205,7 +214,7 @@ def main():
     print(f"Current ENABLE_ZAI_THINKING setting: {thinking_enabled}")
     
     # Test endpoint routing
-    results = test_endpoint_routing()
+    results = asyncio.run(test_endpoint_routing())
     
     # Check logs for evidence
     found_thinking = check_log_evidence()
@@ -11,10 +11,12 @@ This example shows:
 """
 
 import os
-import json
 import time
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from _health_cache import mark_healthy, recently_healthy
+from _log_tail import tail_log
 
 # Load environment variables from .env file
 load_dotenv()
@@ -32,6 +34,11 @@ HEADERS = {
     "x-api-key": API_KEY
 }
 
+# One pooled session shared by all requests, so the proxy connection is reused
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
 def make_request(model, message="Explain quantum computing in simple terms.", use_thinking=None):
     """Make a chat completion request with optional thinking parameter override."""
     payload = {
@@ -49,7 +56,7 @@ def make_request(model, message="Explain quantum computing in simple terms.", us
     print(f"\n🔄 Making request with model: {model}")
     print(f"   Message: {message[:50]}...")
     
-    response = requests.post(f"{BASE_URL}/v1/chat/completions", 
+    response = _SESSION.post(f"{BASE_URL}/v1/chat/completions", 
                            json=payload, 
                            headers=HEADERS)
     
@@ -84,20 +91,14 @@ def check_upstream_logs():
         if os.path.exists(log_file):
             print(f"\n📋 Checking {log_file} for thinking parameter evidence...")
             try:
-                with open(log_file, 'r') as f:
-                    lines = f.readlines()
-                    recent_lines = lines[-5:]  # Check last 5 log entries
+                recent_entries = tail_log(log_file, 5)  # Check last 5 log entries
                     
-                for line in recent_lines:
-                    try:
-                        log_entry = json.loads(line.strip())
-                        if "thinking" in str(log_entry):
-                            print(f"✅ Found thinking parameter in logs:")
-                            print(f"   Endpoint: {log_entry.get('endpoint_type', 'unknown')}")
-                            print(f"   Timestamp: {log_entry.get('timestamp', 'unknown')}")
-                            return True
-                    except json.JSONDecodeError:
-                        continue
+                for log_entry in recent_entries:
+                    if "thinking" in log_entry.get("payload", {}):
+                        print(f"✅ Found thinking parameter in logs:")
+                        print(f"   Endpoint: {log_entry.get('endpoint_type', 'unknown')}")
+                        print(f"   Timestamp: {log_entry.get('timestamp', 'unknown')}")
+                        return True
                         
                 print(f"ℹ️  No thinking parameter found in recent {log_file} entries")
             except Exception as e:
@@ -112,16 +113,18 @@ def main():
     print("🧠 z.ai Thinking Parameter Usage Example")
     print("=" * 50)
     
-    # Check proxy health first
-    try:
-        health_response = requests.get(f"{BASE_URL}/health")
-        if health_response.status_code != 200:
-            print("❌ Proxy server is not healthy")
+    # Check proxy health first, unless another example just did
+    if not recently_healthy(BASE_URL):
+        try:
+            health_response = _SESSION.get(f"{BASE_URL}/health")
+            if health_response.status_code != 200:
+                print("❌ Proxy server is not healthy")
+                return
+        except requests.exceptions.ConnectionError:
+            print("❌ Cannot connect to proxy server. Is it running on http://localhost:5000?")
             return
-        print("✅ Proxy server is healthy")
-    except requests.exceptions.ConnectionError:
-        print("❌ Cannot connect to proxy server. Is it running on http://localhost:5000?")
-        return
+        mark_healthy(BASE_URL)
+    print("✅ Proxy server is healthy")
     
     print("\n1. Testing Model Variants (Thinking Parameter Behavior)")
     print("-" * 55)
@@ -178,7 +181,7 @@ def main():
     }
     
     print("\n🖼️ Making image request (should route to OpenAI with thinking parameter)")
-    image_response = requests.post(f"{BASE_URL}/v1/chat/completions", 
+    image_response = _SESSION.post(f"{BASE_URL}/v1/chat/completions", 
                                  json=image_payload, 
                                  headers=HEADERS)
     
@@ -6,12 +6,11 @@ Demonstrates both OpenAI-compatible and Anthropic-native endpoints.
 
 import asyncio
 import httpx
-import json
 import os
-import requests
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
+from _common import dumps, loads
 
 # Add project root to path and load environment from project root
 project_root = Path(__file__).parent.parent
@@ -22,28 +21,35 @@ load_dotenv(project_root / ".env")
 BASE_URL = "http://localhost:5000"
 API_KEY = os.getenv("SERVER_API_KEY", "your-api-key-here")
 
+# One pooled client shared by all examples, so the proxy connection is reused
+_CLIENT = httpx.Client(
+    base_url=BASE_URL,
+    limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=30.0),
+    timeout=30.0,
+    headers={
+        "Authorization": f"Bearer {API_KEY}",
+        "Content-Type": "application/json"
+    }
+)
+
 def test_text_completion():
     """Example: Text completion using glm-4.6"""
     print("🔤 Testing text completion...")
     
-    response = requests.post(
-        f"{BASE_URL}/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {API_KEY}",
-            "Content-Type": "application/json"
-        },
-        json={
+    response = _CLIENT.post(
+        "/v1/chat/completions",
+        content=dumps({
             "model": "glm-4.6",
             "messages": [
                 {"role": "user", "content": "Write a haiku about programming."}
             ],
             "max_tokens": 100,
             "temperature": 0.7
-        }
+        })
     )
     
     if response.status_code == 200:
-        data = response.json()
+        data = loads(response.content)
         content = data["choices"][0]["message"]["content"]
         usage = data.get("usage", {})
         
@@ -64,13 +70,9 @@ def test_vision_request():
     # Create a simple test image (1x1 pixel PNG)
     test_image_b64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/5+hHgAHggJ/PchI7wAAAABJRU5ErkJggg=="
     
-    response = requests.post(
-        f"{BASE_URL}/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {API_KEY}",
-            "Content-Type": "application/json"
-        },
-        json={
+    response = _CLIENT.post(
+        "/v1/chat/completions",
+        content=dumps({
             "model": "glm-4.6",
             "messages": [
                 {
@@ -87,11 +89,11 @@ def test_vision_request():
                 }
             ],
             "max_tokens": 100
-        }
+        })
     )
     
     if response.status_code == 200:
-        data = response.json()
+        data = loads(response.content)
         content = data["choices"][0]["message"]["content"]
         usage = data.get("usage", {})
         
@@ -109,22 +111,18 @@ def test_token_counting():
     """Example: Token counting"""
     print("🔢 Testing token counting...")
     
-    response = requests.post(
-        f"{BASE_URL}/v1/messages/count_tokens",
-        headers={
-            "Authorization": f"Bearer {API_KEY}",
-            "Content-Type": "application/json"
-        },
-        json={
+    response = _CLIENT.post(
+        "/v1/messages/count_tokens",
+        content=dumps({
             "model": "glm-4.6",
             "messages": [
                 {"role": "user", "content": "How many tokens is this message?"}
             ]
-        }
+        })
     )
     
     if response.status_code == 200:
-        data = response.json()
+        data = loads(response.content)
         token_count = data.get("input_tokens", 0)
         
         print(f"✅ Token counting successful")
@@ -139,13 +137,10 @@ def test_models_endpoint():
     """Example: List available models"""
     print("📋 Testing models endpoint...")
     
-    response = requests.get(
-        f"{BASE_URL}/v1/models",
-        headers={"Authorization": f"Bearer {API_KEY}"}
-    )
+    response = _CLIENT.get("/v1/models")
     
     if response.status_code == 200:
-        data = response.json()
+        data = loads(response.content)
         models = [model["id"] for model in data.get("data", [])]
         
         print(f"✅ Models endpoint successful")
@@ -175,11 +170,14 @@ def main():
     passed = 0
     total = len(examples)
     
-    for name, test_func in examples:
-        print(f"\n🔍 {name}:")
-        if test_func():
-            passed += 1
-        print("-" * 30)
+    try:
+        for name, test_func in examples:
+            print(f"\n🔍 {name}:")
+            if test_func():
+                passed += 1
+            print("-" * 30)
+    finally:
+        _CLIENT.close()
     
     print(f"\n📊 Results: {passed}/{total} examples successful")
     
@@ -17,6 +17,9 @@ API_KEY = os.getenv("API_KEY", "your-api-key-here")
 # Sample base64 encoded 1x1 pixel image (PNG)
 SAMPLE_IMAGE_B64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/5+hHgAHggJ/PchI7wAAAABJRU5ErkJggg=="
 
+# Keep-alive pool for the demo client, so every request after the first reuses its connection
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30.0)
+
 def get_headers():
     return {
         "Authorization": f"Bearer {API_KEY}",
@@ -29,7 +32,7 @@ async def demonstrate_routing():
     print("🔀 Image Model Routing & Token Scaling Demonstration")
     print("=" * 60)
     
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(limits=POOL_LIMITS, timeout=30.0) as client:
         
         # Example 1: Text-only request → Anthropic endpoint
         print("\n1️⃣  Text-only Request (glm-4.5)")
@@ -47,8 +50,7 @@ async def demonstrate_routing():
             response = await client.post(
                 f"{PROXY_BASE_URL}/v1/chat/completions",
                 json=payload,
-                headers=get_headers(),
-                timeout=30.0
+                headers=get_headers()
             )
             
             if response.status_code == 200:
@@ -78,8 +80,7 @@ async def demonstrate_routing():
             response = await client.post(
                 f"{PROXY_BASE_URL}/v1/chat/completions",
                 json=payload,
-                headers=get_headers(),
-                timeout=30.0
+                headers=get_headers()
             )
             
             if response.status_code == 200:
@@ -124,8 +125,7 @@ async def demonstrate_routing():
             response = await client.post(
                 f"{PROXY_BASE_URL}/v1/chat/completions",
                 json=payload,
-                headers=get_headers(),
-                timeout=30.0
+                headers=get_headers()
             )
             
             if response.status_code == 200:
@@ -12,11 +12,20 @@ Requirements:
 - Valid SERVER_API_KEY in .env file
 """
 
-import json
+import asyncio
+import sys
 import time
-import requests
+import httpx
+from functools import lru_cache
+from pathlib import Path
 from dotenv import load_dotenv
 import os
+from typing import List, Optional, Tuple
+
+# Shared example helpers live next to the other examples
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "examples"))
+from _common import (CONNECT_RETRIES, CONNECT_TIMEOUT, HTTP2_AVAILABLE, aiter_sse_lines,
+                     dumps, loads, report, report_lines)
 
 # Load environment variables
 load_dotenv()
@@ -32,19 +41,44 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
-def example_complex_message_conversion():
+@lru_cache(maxsize=256)
+def _prompt_body_head(prompt: str, max_tokens: int) -> bytes:
+    """Serialized single-prompt request body without its closing brace, so a model can be appended"""
+    return dumps({
+        "max_tokens": max_tokens,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    })[:-1]
+
+def _variant_body(model: str, prompt: str, max_tokens: int) -> bytes:
+    """Request body for one model variant, reusing the cached prompt serialization"""
+    return _prompt_body_head(prompt, max_tokens) + b',"model":' + dumps(model) + b'}'
+
+def has_tool_block(message: dict) -> bool:
+    """Whether a message carries a tool_use or tool_result content block"""
+    content = message.get("content")
+    return isinstance(content, list) and any(
+        isinstance(block, dict) and block.get("type") in ("tool_use", "tool_result")
+        for block in content
+    )
+
+async def example_complex_message_conversion(client: httpx.AsyncClient):
     """
     Demonstrates complex message conversion that was previously failing
     but is now working with the v1.6.0 fixes.
     """
-    print("🔧 Complex Message Conversion Example")
-    print("=" * 50)
-    print("This example shows message structures that were previously")
-    print("failing with 'stream has been closed' errors but now work.")
-    print()
+    report("🔧 Complex Message Conversion Example")
+    report("=" * 50)
+    report("This example shows message structures that were previously")
+    report("failing with 'stream has been closed' errors but now work.")
+    report()
     
     # Example 1: System messages + tool calls
-    print("📋 Example 1: System Messages + Tool Calls")
+    report("📋 Example 1: System Messages + Tool Calls")
     
     complex_payload = {
         "model": "glm-4.5-openai",  # Force OpenAI routing to test conversion
@@ -109,60 +143,59 @@ def example_complex_message_conversion():
     }
     
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        print(f"📤 Sending complex message structure...")
-        print(f"   Model: {complex_payload['model']}")
-        print(f"   System blocks: {len(complex_payload.get('system', []))}")
-        print(f"   Messages: {len(complex_payload['messages'])}")
-        print(f"   Tool interactions: {sum(1 for msg in complex_payload['messages'] if 'tool_use' in str(msg) or 'tool_result' in str(msg))}")
+        report(f"📤 Sending complex message structure...")
+        report(f"   Model: {complex_payload['model']}")
+        report(f"   System blocks: {len(complex_payload.get('system', []))}")
+        report(f"   Messages: {len(complex_payload['messages'])}")
+        report(f"   Tool interactions: {sum(map(has_tool_block, complex_payload['messages']))}")
         
-        response = requests.post(
-            f"{BASE_URL}/v1/messages",
-            headers=HEADERS,
-            json=complex_payload,
-            timeout=30
+        response = await client.post(
+            "/v1/messages",
+            content=dumps(complex_payload),
+            timeout=httpx.Timeout(30.0, connect=CONNECT_TIMEOUT)
         )
         
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         
-        print(f"📥 Response received in {duration:.2f}s")
-        print(f"   Status: {response.status_code}")
+        report(f"📥 Response received in {duration:.2f}s")
+        report(f"   Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
-            print(f"✅ SUCCESS! Complex message conversion working")
-            print(f"   Response ID: {result.get('id', 'unknown')}")
-            print(f"   Model: {result.get('model', 'unknown')}")
-            print(f"   Content blocks: {len(result.get('content', []))}")
-            print(f"   Usage: {result.get('usage', {})}")
+            result = loads(response.content)
+            report(f"✅ SUCCESS! Complex message conversion working")
+            report(f"   Response ID: {result.get('id', 'unknown')}")
+            report(f"   Model: {result.get('model', 'unknown')}")
+            report(f"   Content blocks: {len(result.get('content', []))}")
+            report(f"   Usage: {result.get('usage', {})}")
             
             # Show response content preview
             content = result.get('content', [])
             if content and len(content) > 0 and content[0].get('type') == 'text':
                 text = content[0].get('text', '')[:200]
-                print(f"   Content preview: {text}...")
+                report(f"   Content preview: {text}...")
             
             return True
             
         else:
-            print(f"❌ Request failed with status {response.status_code}")
-            print(f"   Response: {response.text}")
+            report(f"❌ Request failed with status {response.status_code}")
+            report(f"   Response: {response.text}")
             return False
             
     except Exception as e:
-        print(f"❌ Error: {e}")
+        report(f"❌ Error: {e}")
         return False
 
-def example_streaming_fix():
+async def example_streaming_fix(client: httpx.AsyncClient):
     """
     Demonstrates that streaming requests no longer return 'stream has been closed' errors
     """
-    print("\n🌊 Streaming Fix Example")
-    print("=" * 30)
-    print("Testing that streaming requests now complete gracefully")
-    print("without 'stream has been closed' errors.")
-    print()
+    report("\n🌊 Streaming Fix Example")
+    report("=" * 30)
+    report("Testing that streaming requests now complete gracefully")
+    report("without 'stream has been closed' errors.")
+    report()
     
     streaming_payload = {
         "model": "glm-4.5-openai",  # Force OpenAI routing
@@ -177,56 +210,59 @@ def example_streaming_fix():
     }
     
     try:
-        print(f"📤 Sending streaming request...")
-        
-        start_time = time.time()
-        response = requests.post(
-            f"{BASE_URL}/v1/messages",
-            headers=HEADERS,
-            json=streaming_payload,
-            stream=True,
-            timeout=30
-        )
+        report(f"📤 Sending streaming request...")
         
-        print(f"📥 Response status: {response.status_code}")
-        
-        if response.status_code == 200:
-            print(f"✅ Streaming request successful (no 500 errors)")
-            print(f"   Content-Type: {response.headers.get('content-type')}")
+        start_time = time.perf_counter()
+        async with client.stream(
+            "POST",
+            "/v1/messages",
+            content=dumps(streaming_payload),
+            # Compressed SSE would be buffered by the decoder; keep events flowing as sent
+            headers={"Accept-Encoding": "identity"},
+            timeout=httpx.Timeout(30.0, connect=CONNECT_TIMEOUT)
+        ) as response:
+            report(f"📥 Response status: {response.status_code}")
             
-            # Check if we get proper streaming response or graceful completion
-            line_count = 0
-            for line in response.iter_lines(decode_unicode=True):
-                if line:
+            if response.status_code == 200:
+                report(f"✅ Streaming request successful (no 500 errors)")
+                report(f"   Content-Type: {response.headers.get('content-type')}")
+                
+                # Check if we get proper streaming response or graceful completion;
+                # leaving the block early closes the rest of the stream
+                line_count = 0
+                lines = aiter_sse_lines(response)
+                async for line in lines:
                     line_count += 1
-                    if line_count <= 3:  # Show first few lines
-                        print(f"   📦 Line {line_count}: {line[:80]}...")
+                    if line_count <= 3:  # Show first few lines; the rest are never decoded
+                        report(f"   📦 Line {line_count}: {line.decode('utf-8', 'replace')[:80]}...")
                     if line_count >= 5:  # Don't spam too much output
                         break
-            
-            duration = time.time() - start_time
-            print(f"   Duration: {duration:.2f}s")
-            print(f"   Lines received: {line_count}")
-            print(f"✅ Streaming completed gracefully (no 'stream has been closed' errors)")
-            
-            return True
-        else:
-            print(f"❌ Streaming failed: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
+                await lines.aclose()
+                
+                duration = time.perf_counter() - start_time
+                report(f"   Duration: {duration:.2f}s")
+                report(f"   Lines received: {line_count}")
+                report(f"✅ Streaming completed gracefully (no 'stream has been closed' errors)")
+                
+                return True
+            else:
+                await response.aread()
+                report(f"❌ Streaming failed: {response.status_code}")
+                report(f"   Response: {response.text}")
+                return False
             
     except Exception as e:
-        print(f"❌ Streaming error: {e}")
+        report(f"❌ Streaming error: {e}")
         return False
 
-def example_model_variants():
+async def example_model_variants(client: httpx.AsyncClient):
     """
     Shows that all model variants work with the conversion fix
     """
-    print("\n🔀 Model Variant Example")
-    print("=" * 25)
-    print("Testing all model variants with complex message conversion")
-    print()
+    report("\n🔀 Model Variant Example")
+    report("=" * 25)
+    report("Testing all model variants with complex message conversion")
+    report()
     
     models_to_test = [
         ("glm-4.5", "Auto-routing"),
@@ -234,48 +270,74 @@ def example_model_variants():
         ("glm-4.5-anthropic", "Force Anthropic (text)")
     ]
     
-    test_payload = {
-        "max_tokens": 50,
-        "messages": [
-            {
-                "role": "user",
-                "content": "Briefly confirm you're working properly."
-            }
-        ]
-    }
+    prompt = "Briefly confirm you're working properly."
     
-    results = []
-    
-    for model, description in models_to_test:
-        print(f"🧪 Testing {model} ({description})")
-        
-        payload = test_payload.copy()
-        payload["model"] = model
-        
+    async def check(model: str) -> Tuple[bool, str]:
         try:
-            response = requests.post(
-                f"{BASE_URL}/v1/messages",
-                headers=HEADERS,
-                json=payload,
-                timeout=15
+            response = await client.post(
+                "/v1/messages",
+                content=_variant_body(model, prompt, 50),
+                timeout=httpx.Timeout(15.0, connect=CONNECT_TIMEOUT)
             )
             
             if response.status_code == 200:
-                result = response.json()
-                print(f"   ✅ {model}: OK")
-                results.append(True)
+                return True, f"   ✅ {model}: OK"
             else:
-                print(f"   ❌ {model}: Failed ({response.status_code})")
-                results.append(False)
+                return False, f"   ❌ {model}: Failed ({response.status_code})"
                 
         except Exception as e:
-            print(f"   ❌ {model}: Error ({e})")
-            results.append(False)
+            return False, f"   ❌ {model}: Error ({e})"
     
-    success_rate = sum(results) / len(results) * 100
-    print(f"\n📊 Model variant success rate: {success_rate:.0f}% ({sum(results)}/{len(results)})")
+    # The variants are independent, so they are requested concurrently and reported in order
+    checks = await asyncio.gather(*(check(model) for model, _ in models_to_test))
     
-    return all(results)
+    passed = 0
+    for (model, description), (ok, line) in zip(models_to_test, checks):
+        report(f"🧪 Testing {model} ({description})")
+        report(line)
+        passed += ok
+    
+    total = len(models_to_test)
+    success_rate = passed * 100 / total
+    report(f"\n📊 Model variant success rate: {success_rate:.0f}% ({passed}/{total})")
+    
+    return passed == total
+
+async def run_examples() -> Optional[List[bool]]:
+    """Check the service, then run the independent examples concurrently over one client"""
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        headers=HEADERS,
+        timeout=httpx.Timeout(30.0, connect=CONNECT_TIMEOUT),
+        transport=httpx.AsyncHTTPTransport(retries=CONNECT_RETRIES, http2=HTTP2_AVAILABLE)
+    ) as client:
+        # Test service health first
+        try:
+            health_response = await client.get("/health", timeout=httpx.Timeout(5.0, connect=CONNECT_TIMEOUT))
+            if health_response.status_code != 200:
+                print("❌ Service not available. Please start the proxy:")
+                print("   docker compose up -d")
+                return None
+        except:
+            print("❌ Cannot connect to proxy. Please ensure it's running:")
+            print("   docker compose up -d")
+            return None
+        
+        print("✅ Service is healthy, running examples...")
+        print()
+        
+        async def run(example) -> Tuple[bool, list]:
+            lines = []
+            report_lines.set(lines)  # Each task has its own context, so this stays local
+            return await example(client), lines
+        
+        examples = (example_complex_message_conversion, example_streaming_fix, example_model_variants)
+        outcomes = await asyncio.gather(*(run(example) for example in examples))
+    
+    # Print each example's output in order once all of them have finished
+    for _, lines in outcomes:
+        print("\n".join(lines))
+    return [ok for ok, _ in outcomes]
 
 def main():
     """
@@ -287,25 +349,10 @@ def main():
     print("streaming 'stream has been closed' errors.")
     print()
     
-    # Test service health first
-    try:
-        health_response = requests.get(f"{BASE_URL}/health", timeout=5)
-        if health_response.status_code != 200:
-            print("❌ Service not available. Please start the proxy:")
-            print("   docker compose up -d")
-            return False
-    except:
-        print("❌ Cannot connect to proxy. Please ensure it's running:")
-        print("   docker compose up -d")
+    results = asyncio.run(run_examples())
+    if results is None:
         return False
-    
-    print("✅ Service is healthy, running examples...")
-    print()
-    
-    # Run examples
-    complex_ok = example_complex_message_conversion()
-    streaming_ok = example_streaming_fix()
-    variants_ok = example_model_variants()
+    complex_ok, streaming_ok, variants_ok = results
     
     # Summary
     print("\n" + "=" * 60)
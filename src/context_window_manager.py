@@ -16,16 +16,16 @@ Solution:
 - Seamless integration with accurate token counting and image handling
 """
 
+import hashlib
 import json
 import os
-import math
-import re
-import asyncio
+import threading
 import time
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from functools import lru_cache
+from itertools import accumulate, takewhile
 from dotenv import load_dotenv
 try:
     import tiktoken
@@ -34,8 +34,16 @@ except ImportError:
     tiktoken = None
     TIKTOKEN_AVAILABLE = False
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (once per process; helpers below reuse the guard)
+_dotenv_loaded = False
+
+def _load_dotenv_once():
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+
+_load_dotenv_once()
 
 # Import configuration values
 ANTHROPIC_EXPECTED_TOKENS = int(os.getenv("ANTHROPIC_EXPECTED_TOKENS", "200000"))
@@ -56,6 +64,10 @@ CONDENSATION_TIMEOUT = int(os.getenv("CONDENSATION_TIMEOUT", "30"))
 # Performance and caching configuration
 ENABLE_CONTEXT_PERFORMANCE_LOGGING = os.getenv("ENABLE_CONTEXT_PERFORMANCE_LOGGING", "false").lower() in ("true", "1", "yes")
 CONTEXT_CACHE_SIZE = int(os.getenv("CONTEXT_CACHE_SIZE", "100"))
+MESSAGE_TOKEN_CACHE_SIZE = int(os.getenv("MESSAGE_TOKEN_CACHE_SIZE", "1024"))
+
+# Messages limited to these keys are counted from role and text content alone
+_PLAIN_MESSAGE_KEYS = frozenset(('role', 'content'))
 CONTEXT_ANALYSIS_CACHE_TTL = int(os.getenv("CONTEXT_ANALYSIS_CACHE_TTL", "300"))
 
 # Context management enums and data classes
@@ -102,118 +114,239 @@ class ContextManagementResult:
     metadata: Dict[str, Any]
 
 # Enhanced debug logger (avoid circular imports)
+# Messages may take %-style args, which are only formatted when the line is printed,
+# so disabled debug/info calls on the request path cost a single flag check
 class SimpleLogger:
-    def debug(self, msg):
-        if ENABLE_CONTEXT_PERFORMANCE_LOGGING:
-            print(f"[CONTEXT_DEBUG] {msg}")
-    def info(self, msg):
-        if ENABLE_CONTEXT_PERFORMANCE_LOGGING:
-            print(f"[CONTEXT_INFO] {msg}")
-    def warning(self, msg): print(f"[CONTEXT_WARNING] {msg}")
-    def error(self, msg): print(f"[CONTEXT_ERROR] {msg}")
+    def __init__(self, enabled: bool = ENABLE_CONTEXT_PERFORMANCE_LOGGING):
+        self.enabled = enabled
+    def debug(self, msg, *args):
+        if self.enabled:
+            print(f"[CONTEXT_DEBUG] {msg % args if args else msg}")
+    def info(self, msg, *args):
+        if self.enabled:
+            print(f"[CONTEXT_INFO] {msg % args if args else msg}")
+    def warning(self, msg, *args): print(f"[CONTEXT_WARNING] {msg % args if args else msg}")
+    def error(self, msg, *args): print(f"[CONTEXT_ERROR] {msg % args if args else msg}")
 
 debug_logger = SimpleLogger()
 
+# cl100k_base encoding shared by every call; loaded on first use
+_ENCODING = None
+_ENCODING_LOCK = threading.Lock()
+
+def _get_encoding():
+    """Return the cached cl100k_base encoding, loading it once (failures are retried next call)"""
+    global _ENCODING
+    if _ENCODING is None:
+        with _ENCODING_LOCK:
+            if _ENCODING is None:
+                _ENCODING = tiktoken.get_encoding("cl100k_base")
+    return _ENCODING
+
+# Below this many strings a thread pool costs more than it saves
+BATCH_ENCODE_MIN_TEXTS = 16
+
+def _count_text_tokens(encoding, texts: List[str]) -> List[int]:
+    """Token count per string; special-token markers in chat content are counted as text"""
+    if not encoding:
+        # Fallback estimation: ~4 characters per token
+        return [len(text) // 4 for text in texts]
+    
+    # Empty strings and single ASCII characters (every byte is a token) are counted
+    # without crossing into the tokenizer
+    counts = [len(text) if len(text) < 2 and text.isascii() else -1 for text in texts]
+    pending = [i for i, count in enumerate(counts) if count < 0]
+    if len(pending) >= BATCH_ENCODE_MIN_TEXTS:
+        encoded = encoding.encode_ordinary_batch([texts[i] for i in pending])
+    else:
+        encode = encoding.encode_ordinary
+        encoded = [encode(texts[i]) for i in pending]
+    for i, ids in zip(pending, encoded):
+        counts[i] = len(ids)
+    return counts
+
+# Characters of a long text to tokenize when cutting it to a token budget; cl100k
+# averages about 4 characters per token, so this prefix holds the budget with room to spare
+TRUNCATE_PREFIX_CHARS_PER_TOKEN = 8
+
+def _truncate_text(text: str, target_tokens: int) -> Optional[str]:
+    """Leading part of text that fits in target_tokens, or None if the whole text fits"""
+    encoding = None
+    if TIKTOKEN_AVAILABLE:
+        try:
+            encoding = _get_encoding()
+        except Exception:
+            encoding = None
+    
+    if encoding is None:
+        # Rough calculation: keep target_tokens * 3 characters
+        target_chars = target_tokens * 3
+        return text[:target_chars] if len(text) > target_chars else None
+    
+    # Cut on a token boundary, leaving 16 tokens for the truncation marker (~9 tokens),
+    # role formatting (3) and a merge across the cut. Only a bounded prefix is encoded,
+    # so multi-megabyte messages cost no more than the budget
+    max_tokens = max(target_tokens - 16, 0)
+    prefix_chars = max(max_tokens, 1) * TRUNCATE_PREFIX_CHARS_PER_TOKEN
+    while True:
+        prefix = text[:prefix_chars]
+        ids = encoding.encode_ordinary(prefix)
+        if len(ids) > max_tokens:
+            break
+        if len(prefix) == len(text):
+            return None
+        # Highly compressible text fits more characters per token; widen the prefix
+        # so the cut lands at the budget instead of well short of it
+        prefix_chars *= 2
+    
+    # A token cut can fall inside a multibyte character; drop that partial tail
+    # rather than let it decode to U+FFFD
+    raw = encoding.decode_bytes(ids[:max_tokens])
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError as e:
+        return raw[:e.start].decode('utf-8')
+
+def _inline_image_bytes(item: Dict[str, Any]) -> int:
+    """Approximate decoded size of a base64 image block from its length alone (0 if not inline)"""
+    source = item.get('source')
+    if isinstance(source, dict):
+        data = source.get('data') if source.get('type') == 'base64' else None
+        return len(data) * 3 >> 2 if isinstance(data, str) else 0
+    
+    image_url = item.get('image_url')
+    url = image_url.get('url') if isinstance(image_url, dict) else image_url
+    if not isinstance(url, str) or not url.startswith('data:'):
+        return 0
+    # Measure the payload after the comma without slicing the (possibly large) string
+    comma = url.find(',')
+    return (len(url) - comma - 1) * 3 >> 2 if comma >= 0 else 0
+
+def _image_tokens_per_kb() -> float:
+    """IMAGE_TOKENS_PER_KB from the environment, 0 (off) when unset, malformed or negative"""
+    try:
+        return max(float(os.getenv("IMAGE_TOKENS_PER_KB", "0")), 0.0)
+    except ValueError:
+        return 0.0
+
 def simple_count_tokens_from_messages(messages: List[Dict[str, Any]],
                                      image_descriptions: Optional[Dict[str, str]] = None) -> int:
     """Accurate token counting using tiktoken with dynamic image token calculation"""
     try:
         # Load configuration for dynamic image token calculation
-        from dotenv import load_dotenv
-        load_dotenv()
+        _load_dotenv_once()
         
         BASE_IMAGE_TOKENS = int(os.getenv("BASE_IMAGE_TOKENS", "85"))
         IMAGE_TOKENS_PER_CHAR = float(os.getenv("IMAGE_TOKENS_PER_CHAR", "0.25"))
+        IMAGE_TOKENS_PER_KB = _image_tokens_per_kb()
         ENABLE_DYNAMIC_IMAGE_TOKENS = os.getenv("ENABLE_DYNAMIC_IMAGE_TOKENS", "true").lower() in ("true", "1", "yes")
         
         # Use tiktoken for accurate token counting if available
         if TIKTOKEN_AVAILABLE:
-            encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 tokenizer
+            encoding = _get_encoding()  # GPT-4 tokenizer
         else:
             # Fallback when tiktoken is not available
             encoding = None
         total_tokens = 0
         
+        # Gather every string to tokenize so they can be encoded in one batch
+        texts = []
+        description_slots = []  # Indices into texts that hold image descriptions
+        
         for i, msg in enumerate(messages):
             # Add role tokens (approximately)
             total_tokens += 3  # role + formatting tokens
             
             content = msg.get('content', '')
             if isinstance(content, str):
-                if encoding:
-                    total_tokens += len(encoding.encode(content))
-                else:
-                    # Fallback estimation: ~4 characters per token
-                    total_tokens += len(content) // 4
+                texts.append(content)
             elif isinstance(content, list):
                 for j, item in enumerate(content):
                     if isinstance(item, dict):
                         if item.get('type') == 'text':
-                            if encoding:
-                                total_tokens += len(encoding.encode(item.get('text', '')))
-                            else:
-                                # Fallback estimation: ~4 characters per token
-                                total_tokens += len(item.get('text', '')) // 4
+                            texts.append(item.get('text', ''))
                         elif item.get('type') in ['image', 'image_url']:
                             # Use dynamic image token calculation if enabled
                             if ENABLE_DYNAMIC_IMAGE_TOKENS:
                                 # Use image description if available
                                 if image_descriptions and f"{i}_{j}" in image_descriptions:
-                                    description = image_descriptions[f"{i}_{j}"]
-                                    # Calculate tokens based on description length
-                                    if encoding:
-                                        description_tokens = len(encoding.encode(description))
-                                    else:
-                                        description_tokens = len(description) // 4
-                                    total_tokens += BASE_IMAGE_TOKENS + int(description_tokens * IMAGE_TOKENS_PER_CHAR)
+                                    description_slots.append(len(texts))
+                                    texts.append(image_descriptions[f"{i}_{j}"])
                                 else:
-                                    # Use base image tokens if no description
+                                    # Use base image tokens if no description, scaled by
+                                    # inline image size when a per-KB rate is configured
                                     total_tokens += BASE_IMAGE_TOKENS
+                                    if IMAGE_TOKENS_PER_KB:
+                                        total_tokens += int((_inline_image_bytes(item) >> 10) * IMAGE_TOKENS_PER_KB)
                             else:
                                 # Fallback to fixed 1000 tokens for backward compatibility
                                 total_tokens += 1000
         
-        return total_tokens
+        text_tokens = _count_text_tokens(encoding, texts)
+        
+        # Calculate image tokens based on description length
+        for slot in description_slots:
+            total_tokens += BASE_IMAGE_TOKENS + int(text_tokens[slot] * IMAGE_TOKENS_PER_CHAR)
+            text_tokens[slot] = 0
+        
+        return total_tokens + sum(text_tokens)
     except Exception as e:
-        debug_logger.warning(f"tiktoken failed, using fallback: {e}")
+        debug_logger.warning("tiktoken failed, using fallback: %s", e)
         # Fallback to rough estimation with dynamic image tokens
-        load_dotenv()
+        _load_dotenv_once()
         
         BASE_IMAGE_TOKENS = int(os.getenv("BASE_IMAGE_TOKENS", "85"))
         IMAGE_TOKENS_PER_CHAR = float(os.getenv("IMAGE_TOKENS_PER_CHAR", "0.25"))
+        IMAGE_TOKENS_PER_KB = _image_tokens_per_kb()
         ENABLE_DYNAMIC_IMAGE_TOKENS = os.getenv("ENABLE_DYNAMIC_IMAGE_TOKENS", "true").lower() in ("true", "1", "yes")
         
-        total_chars = 0
-        for i, msg in enumerate(messages):
-            content = msg.get('content', '')
-            if isinstance(content, str):
-                total_chars += len(content)
-            elif isinstance(content, list):
+        contents = [msg.get('content', '') for msg in messages]
+        
+        # Plain string contents (the common case) are measured in one pass over map(len)
+        text_chars = sum(map(len, [content for content in contents if isinstance(content, str)]))
+        
+        # Structured contents are counted in half-characters so the ~3.5 chars/token
+        # ratio stays integral
+        def part_half_chars():
+            for i, content in enumerate(contents):
+                if not isinstance(content, list):
+                    continue
                 for j, item in enumerate(content):
-                    if isinstance(item, dict):
-                        if item.get('type') == 'text':
-                            total_chars += len(item.get('text', ''))
-                        elif item.get('type') in ['image', 'image_url']:
-                            # Use dynamic image token calculation in fallback
-                            if ENABLE_DYNAMIC_IMAGE_TOKENS:
-                                if image_descriptions and f"{i}_{j}" in image_descriptions:
-                                    description = image_descriptions[f"{i}_{j}"]
-                                    # Estimate tokens from description length
-                                    description_chars = len(description)
-                                    estimated_tokens = BASE_IMAGE_TOKENS + int(description_chars * IMAGE_TOKENS_PER_CHAR)
-                                    total_chars += estimated_tokens * 3.5  # Convert back to chars for consistency
-                                else:
-                                    total_chars += BASE_IMAGE_TOKENS * 3.5  # Convert to chars
+                    if not isinstance(item, dict):
+                        continue
+                    item_get = item.get
+                    item_type = item_get('type')
+                    if item_type == 'text':
+                        yield len(item_get('text', '')) << 1
+                    elif item_type in ('image', 'image_url'):
+                        # Use dynamic image token calculation in fallback
+                        if ENABLE_DYNAMIC_IMAGE_TOKENS:
+                            key = f"{i}_{j}"
+                            if image_descriptions and key in image_descriptions:
+                                # Estimate tokens from description length
+                                estimated_tokens = BASE_IMAGE_TOKENS + int(len(image_descriptions[key]) * IMAGE_TOKENS_PER_CHAR)
+                                yield estimated_tokens * 7  # 3.5 chars per token
                             else:
-                                total_chars += 1000  # Fixed estimate
+                                image_tokens = BASE_IMAGE_TOKENS
+                                if IMAGE_TOKENS_PER_KB:
+                                    image_tokens += int((_inline_image_bytes(item) >> 10) * IMAGE_TOKENS_PER_KB)
+                                yield image_tokens * 7
+                        else:
+                            yield 2000  # Fixed estimate of 1000 chars
         
         # Rough estimate: ~3.5 characters per token
-        return int(total_chars / 3.5) + 100  # Add overhead for formatting
+        return ((text_chars << 1) + sum(part_half_chars())) // 7 + 100  # Add overhead for formatting
 
 # Context window safety margins (leave room for response)
 SAFETY_MARGIN_PERCENT = 0.90  # Use 85% of context window
 MIN_RESPONSE_TOKENS = 4096    # Reserve for response
 
+# Quick pre-check: no tokenizer emits more tokens than input bytes, so prompts whose
+# UTF-8 size stays under the warning threshold skip full token estimation
+QUICK_CHECK_MESSAGE_TOKENS = 16  # Allowance for role formatting and metadata keys per message
+QUICK_CHECK_PART_TOKENS = 20     # Allowance for tool call / structured part formatting
+QUICK_CHECK_REQUEST_TOKENS = 100 # Fixed overhead the fallback estimators add once per request
+
 # Import condensation system
 try:
     from .message_condenser import condense_messages_if_needed, condensation_engine
@@ -221,7 +354,7 @@ try:
     debug_logger.info("AI condensation system loaded successfully")
 except ImportError as e:
     CONDENSATION_AVAILABLE = False
-    debug_logger.warning(f"AI condensation system not available: {e}")
+    debug_logger.warning("AI condensation system not available: %s", e)
 
 # Import chunk management system
 try:
@@ -231,7 +364,7 @@ try:
 except ImportError as e:
     CHUNK_MANAGEMENT_AVAILABLE = False
     ENABLE_CHUNK_BASED_CONDENSATION = False
-    debug_logger.warning(f"Chunk management system not available: {e}")
+    debug_logger.warning("Chunk management system not available: %s", e)
 
 class ContextWindowManager:
     """Intelligent context window manager with AI-powered condensation and multi-level validation"""
@@ -241,6 +374,10 @@ class ContextWindowManager:
         self.text_limit = int(REAL_TEXT_MODEL_TOKENS * SAFETY_MARGIN_PERCENT)
         self.vision_limit = int(REAL_VISION_MODEL_TOKENS * SAFETY_MARGIN_PERCENT)
         
+        # Real and reserved limits keyed by is_vision, so lookups skip the branching
+        self._limits = {True: REAL_VISION_MODEL_TOKENS, False: REAL_TEXT_MODEL_TOKENS}
+        self._effective_limits = {True: self.vision_limit, False: self.text_limit}
+        
         # Initialize AI condensation engine
         self.condensation_engine = None
         if CONDENSATION_AVAILABLE:
@@ -249,7 +386,7 @@ class ContextWindowManager:
                 self.condensation_engine = AICondensationEngine()
                 debug_logger.info("AI condensation engine initialized successfully")
             except Exception as e:
-                debug_logger.error(f"Failed to initialize AI condensation engine: {e}")
+                debug_logger.error("Failed to initialize AI condensation engine: %s", e)
         
         # Initialize accurate token counter
         self.token_counter = None
@@ -258,7 +395,7 @@ class ContextWindowManager:
             self.token_counter = get_token_counter()
             debug_logger.info("Accurate token counter initialized successfully")
         except Exception as e:
-            debug_logger.warning(f"Failed to initialize accurate token counter: {e}")
+            debug_logger.warning("Failed to initialize accurate token counter: %s", e)
         
         # Initialize chunk manager
         self.chunk_manager = None
@@ -267,7 +404,7 @@ class ContextWindowManager:
                 self.chunk_manager = get_chunk_manager()
                 debug_logger.info("Chunk manager initialized successfully")
             except Exception as e:
-                debug_logger.error(f"Failed to initialize chunk manager: {e}")
+                debug_logger.error("Failed to initialize chunk manager: %s", e)
         
         # Initialize environment details manager
         self.env_details_manager = None
@@ -276,22 +413,24 @@ class ContextWindowManager:
             self.env_details_manager = get_environment_details_manager()
             debug_logger.info("Environment details manager initialized successfully")
         except Exception as e:
-            debug_logger.warning(f"Failed to initialize environment details manager: {e}")
+            debug_logger.warning("Failed to initialize environment details manager: %s", e)
         
         # Performance caching
         self._analysis_cache = {}
+        # Keyed on a digest of the content so cached entries don't keep request bodies alive
+        self._message_token_cache: "OrderedDict[Tuple[Any, bytes], int]" = OrderedDict()
+        self._message_token_cache_lock = threading.Lock()
         self._cache_timestamps = {}
         
     def get_context_limit(self, is_vision: bool) -> int:
         """Get real context limit for endpoint type"""
-        return REAL_VISION_MODEL_TOKENS if is_vision else REAL_TEXT_MODEL_TOKENS
+        return self._limits[bool(is_vision)]
     
     def get_effective_limit(self, is_vision: bool, include_response_reserve: bool = True) -> int:
         """Get effective limit with optional response token reservation"""
-        real_limit = self.get_context_limit(is_vision)
         if include_response_reserve:
-            return int(real_limit * SAFETY_MARGIN_PERCENT)
-        return real_limit
+            return self._effective_limits[bool(is_vision)]
+        return self._limits[bool(is_vision)]
     
     def estimate_message_tokens(self, messages: List[Dict[str, Any]],
                               image_descriptions: Optional[Dict[int, str]] = None,
@@ -311,8 +450,8 @@ class ContextWindowManager:
             # Use accurate token counter if available
             if self.token_counter:
                 return self.token_counter.count_messages_tokens(
-                    messages, endpoint_type, image_descriptions
-                )
+                    messages, endpoint_type, image_descriptions=image_descriptions
+                ).total_tokens
             
             # Try to use the global accurate token counting function
             try:
@@ -330,14 +469,46 @@ class ContextWindowManager:
                 # Fallback to simple estimation with image descriptions
                 return simple_count_tokens_from_messages(messages, image_descriptions)
         except Exception as e:
-            debug_logger.warning(f"Token estimation failed: {e}")
+            debug_logger.warning("Token estimation failed: %s", e)
             # Fallback: rough estimate based on character count with image descriptions
             return simple_count_tokens_from_messages(messages, image_descriptions)
     
+    def _estimate_single(self, msg: Dict[str, Any], cache: Dict[int, int]) -> int:
+        """
+        Estimate tokens for one message, memoized by message identity
+        
+        The cache is meant to live for a single truncation pass, while the
+        messages it is keyed on are guaranteed to stay alive.
+        """
+        key = id(msg)
+        tokens = cache.get(key)
+        if tokens is None:
+            tokens = cache[key] = self._estimate_by_content(msg)
+        return tokens
+    
+    def _estimate_by_content(self, msg: Dict[str, Any]) -> int:
+        """Estimate tokens for one message, memoized across requests for plain text messages"""
+        content = msg.get('content')
+        if not isinstance(content, str) or not _PLAIN_MESSAGE_KEYS.issuperset(msg):
+            return self.estimate_message_tokens([msg])
+        
+        key = (msg.get('role'), hashlib.blake2b(content.encode('utf-8', 'surrogatepass')).digest())
+        with self._message_token_cache_lock:
+            tokens = self._message_token_cache.get(key)
+            if tokens is not None:
+                self._message_token_cache.move_to_end(key)
+                return tokens
+        
+        # Estimated outside the lock; a concurrent miss on the same content just stores it twice
+        tokens = self.estimate_message_tokens([msg])
+        with self._message_token_cache_lock:
+            self._message_token_cache[key] = tokens
+            if len(self._message_token_cache) > MESSAGE_TOKEN_CACHE_SIZE:
+                self._message_token_cache.popitem(last=False)
+        return tokens
+    
     def _generate_cache_key(self, messages: List[Dict[str, Any]], is_vision: bool) -> str:
         """Generate cache key for context analysis"""
-        import hashlib
-        
         # Create a simplified representation for caching
         message_summary = []
         for msg in messages:
@@ -364,7 +535,8 @@ class ContextWindowManager:
                             messages: List[Dict[str, Any]],
                             is_vision: bool,
                             image_descriptions: Optional[Dict[int, str]] = None,
-                            max_tokens: Optional[int] = None) -> ContextAnalysisResult:
+                            max_tokens: Optional[int] = None,
+                            current_tokens: Optional[int] = None) -> ContextAnalysisResult:
         """
         Analyze current context state and determine risk level and recommended strategy
         
@@ -373,14 +545,18 @@ class ContextWindowManager:
             is_vision: Whether this is a vision request
             image_descriptions: Optional dictionary mapping image indices to descriptions
             max_tokens: Optional maximum tokens for response
+            current_tokens: Optional token count the caller already estimated for these messages
         
         Returns:
             ContextAnalysisResult with detailed analysis
         """
         start_time = time.time()
         
-        # Check cache first
+        # Check cache first; a caller-supplied count is part of the key, since the
+        # message key alone can't tell a quick estimate from a full one
         cache_key = self._generate_cache_key(messages, is_vision)
+        if current_tokens is not None:
+            cache_key = f"{cache_key}:{current_tokens}"
         current_time = time.time()
         
         if (cache_key in self._analysis_cache and
@@ -392,7 +568,8 @@ class ContextWindowManager:
         
         # Get token count and limits
         endpoint_type = "openai" if is_vision else "anthropic"
-        current_tokens = self.estimate_message_tokens(messages, image_descriptions, endpoint_type)
+        if current_tokens is None:
+            current_tokens = self.estimate_message_tokens(messages, image_descriptions, endpoint_type)
         limit_tokens = self.get_context_limit(is_vision)
         
         # Reserve tokens for response if specified
@@ -528,18 +705,21 @@ class ContextWindowManager:
                 dedup_result = self.env_details_manager.deduplicate_environment_details(messages)
                 deduplicated_messages = dedup_result.deduplicated_messages
                 env_tokens_saved = dedup_result.tokens_saved
-                debug_logger.info(f"Environment details deduplication: removed {len(dedup_result.removed_blocks)} blocks, saved {env_tokens_saved} tokens")
+                debug_logger.info("Environment details deduplication: removed %d blocks, saved %d tokens",
+                                  len(dedup_result.removed_blocks), env_tokens_saved)
             except Exception as e:
-                debug_logger.warning(f"Environment details deduplication failed: {e}")
+                debug_logger.warning("Environment details deduplication failed: %s", e)
                 deduplicated_messages = messages
         
         original_tokens = self.estimate_message_tokens(deduplicated_messages, image_descriptions, "openai" if is_vision else "anthropic")
         
         # Analyze current context state
-        analysis = self.analyze_context_state(deduplicated_messages, is_vision, image_descriptions, max_tokens)
+        analysis = self.analyze_context_state(deduplicated_messages, is_vision, image_descriptions, max_tokens,
+                                              current_tokens=original_tokens)
         
-        debug_logger.info(f"Context analysis: {analysis.risk_level.value} ({analysis.utilization_percent:.1f}% utilization), "
-                         f"strategy: {analysis.recommended_strategy.value}")
+        debug_logger.info("Context analysis: %s (%.1f%% utilization), strategy: %s",
+                          analysis.risk_level.value, analysis.utilization_percent,
+                          analysis.recommended_strategy.value)
         
         # Handle different risk levels
         if analysis.risk_level == ContextRiskLevel.SAFE:
@@ -558,7 +738,7 @@ class ContextWindowManager:
         
         elif analysis.risk_level == ContextRiskLevel.CAUTION:
             # Monitor only, no action needed but log warning
-            debug_logger.info(f"Context approaching limit ({analysis.utilization_percent:.1f}%), monitoring only")
+            debug_logger.info("Context approaching limit (%.1f%%), monitoring only", analysis.utilization_percent)
             return ContextManagementResult(
                 original_messages=original_messages,
                 processed_messages=deduplicated_messages,
@@ -575,7 +755,7 @@ class ContextWindowManager:
             # Apply AI condensation
             if ENABLE_AI_CONDENSATION and self.condensation_engine and analysis.should_condense:
                 try:
-                    debug_logger.info(f"Applying AI condensation with {analysis.recommended_strategy.value} strategy")
+                    debug_logger.info("Applying AI condensation with %s strategy", analysis.recommended_strategy.value)
                     
                     # Determine target tokens based on strategy
                     real_limit = self.get_context_limit(is_vision)
@@ -632,7 +812,7 @@ class ContextWindowManager:
                     )
                     
                 except Exception as e:
-                    debug_logger.error(f"AI condensation failed: {e}")
+                    debug_logger.error("AI condensation failed: %s", e)
                     # Fall through to emergency truncation
         
         # Emergency truncation for overflow or failed condensation
@@ -679,36 +859,85 @@ class ContextWindowManager:
         - (is_valid, estimated_tokens, reason)
         """
         endpoint_type = "openai" if is_vision else "anthropic"
+        response_limit = max_tokens if max_tokens and max_tokens > 0 else 0
+        
+        # Skip full estimation when an upper bound on the token count stays under the
+        # warning threshold, where the full path would return the same verdict. The
+        # bound only decides the shortcut; the reported count is the ~4 chars/token average
+        if not image_descriptions:
+            quick_size = self._quick_size(messages)
+            if quick_size is not None:
+                quick_chars, token_bound = quick_size
+                if token_bound + response_limit < self.get_context_limit(is_vision) * CONDENSATION_WARNING_THRESHOLD:
+                    debug_logger.debug("Context window OK by quick check: ~%d tokens, at most %d (%s endpoint)",
+                                       quick_chars // 4, token_bound, endpoint_type)
+                    return True, quick_chars // 4, ""
+        
         estimated_tokens = self.estimate_message_tokens(messages, image_descriptions, endpoint_type)
         
         # Analyze context state
-        analysis = self.analyze_context_state(messages, is_vision, image_descriptions, max_tokens)
+        analysis = self.analyze_context_state(messages, is_vision, image_descriptions, max_tokens,
+                                              current_tokens=estimated_tokens)
         
         # Use REAL hard limits for validation
-        real_limit = REAL_VISION_MODEL_TOKENS if is_vision else REAL_TEXT_MODEL_TOKENS
-        
-        # Only reserve response tokens if user specified max_tokens
-        if max_tokens and max_tokens > 0:
-            response_limit = max_tokens
-        else:
-            response_limit = 0
+        real_limit = self.get_context_limit(is_vision)
         
         total_needed = estimated_tokens + response_limit
         
         if total_needed <= real_limit:
             if analysis.risk_level in [ContextRiskLevel.WARNING, ContextRiskLevel.CRITICAL]:
                 reason = f"Context within limits but approaching threshold: {analysis.utilization_percent:.1f}% utilization. Consider context management."
-                debug_logger.info(f"Context OK but caution advised: {reason}")
+                debug_logger.info("Context OK but caution advised: %s", reason)
                 return True, estimated_tokens, reason
             else:
-                debug_logger.debug(f"Context window OK: {estimated_tokens} input + {response_limit} response = {total_needed} <= {real_limit} ({endpoint_type} endpoint)")
+                debug_logger.debug("Context window OK: %d input + %d response = %d <= %d (%s endpoint)",
+                                   estimated_tokens, response_limit, total_needed, real_limit, endpoint_type)
                 return True, estimated_tokens, ""
         
         overflow = total_needed - real_limit
         reason = f"Hard context limit exceeded: {total_needed} tokens needed > {real_limit} limit ({endpoint_type} endpoint). Overflow: {overflow} tokens. Risk level: {analysis.risk_level.value}"
-        debug_logger.warning(f"Context validation failed: {reason}")
+        debug_logger.warning("Context validation failed: %s", reason)
         return False, estimated_tokens, reason
     
+    def _quick_size(self, messages: List[Dict[str, Any]]) -> Optional[Tuple[int, int]]:
+        """
+        Cheap (character count, token upper bound) of messages, or None when it can't be bounded
+
+        Text is bounded by its UTF-8 bytes and structured values by their JSON encoding,
+        which is never shorter than the UTF-8 text it holds. Images are priced by
+        configuration, so messages with images go through full estimation.
+        """
+        texts = []
+        bound = QUICK_CHECK_REQUEST_TOKENS
+        for msg in messages:
+            bound += QUICK_CHECK_MESSAGE_TOKENS
+            for key, value in msg.items():
+                if key == 'content':
+                    continue
+                if isinstance(value, str):
+                    # role, name, tool_call_id and similar metadata fields
+                    texts.append(value)
+                elif key == 'tool_calls' and value:
+                    texts.append(json.dumps(value, default=str))
+                    bound += QUICK_CHECK_PART_TOKENS * len(value)
+            content = msg.get('content', '')
+            if isinstance(content, str):
+                texts.append(content)
+            elif isinstance(content, list):
+                for part in content:
+                    if isinstance(part, str):
+                        texts.append(part)
+                    elif isinstance(part, dict) and part.get('type') == 'text':
+                        texts.append(part.get('text', ''))
+                    elif isinstance(part, dict) and part.get('type') in ('image', 'image_url'):
+                        return None
+                    else:
+                        texts.append(json.dumps(part, default=str))
+                        bound += QUICK_CHECK_PART_TOKENS
+            elif content:
+                texts.append(str(content))
+        return sum(map(len, texts)), bound + sum(len(text.encode('utf-8')) for text in texts)
+    
     def truncate_messages_smart(self, 
                               messages: List[Dict[str, Any]], 
                               target_tokens: int) -> Tuple[List[Dict[str, Any]], int]:
@@ -725,97 +954,108 @@ class ContextWindowManager:
             return messages, 0
         
         # Always keep system message and last user message
-        system_msgs = [msg for msg in messages if msg.get('role') == 'system']
-        user_msgs = [msg for msg in messages if msg.get('role') == 'user']
-        assistant_msgs = [msg for msg in messages if msg.get('role') == 'assistant']
+        system_msgs, user_msgs, assistant_msgs = [], [], []
+        bucket = {'system': system_msgs.append, 'user': user_msgs.append, 'assistant': assistant_msgs.append}
+        for msg in messages:
+            add = bucket.get(msg.get('role'))
+            if add:
+                add(msg)
         
         if not user_msgs:
             return messages, self.estimate_message_tokens(messages)
         
+        # Per-message token counts for this pass, so no message is estimated twice
+        token_cache: Dict[int, int] = {}
+        
         # Start with required messages (system + last user)
         required_msgs = system_msgs[:1] + [user_msgs[-1]]  # First system + last user
-        required_tokens = self.estimate_message_tokens(required_msgs)
+        required_tokens = sum(self._estimate_single(msg, token_cache) for msg in required_msgs)
         
         if required_tokens >= target_tokens:
             # Even required messages are too large, truncate last user message
             debug_logger.warning("Even required messages exceed limit, truncating user message")
-            return self._truncate_single_message(required_msgs, target_tokens)
+            return self._truncate_single_message(required_msgs, target_tokens, token_cache)
         
         # Add messages from recent history until we hit limit
         remaining_tokens = target_tokens - required_tokens
-        additional_msgs = []
         
-        # Add recent conversation pairs (user + assistant)
+        # Add recent conversation pairs (user + assistant), most recent first
         recent_pairs = []
         for i in range(len(user_msgs) - 1, 0, -1):  # Start from second-to-last user msg
             user_msg = user_msgs[i-1]
-            # Find corresponding assistant message
-            assistant_msg = None
-            for j, a_msg in enumerate(assistant_msgs):
-                if j == i-1:  # Assuming alternating pattern
-                    assistant_msg = a_msg
-                    break
+            # Find corresponding assistant message (assuming alternating pattern)
+            assistant_msg = assistant_msgs[i-1] if i-1 < len(assistant_msgs) else None
             
             if assistant_msg:
-                recent_pairs.insert(0, (user_msg, assistant_msg))
+                recent_pairs.append((user_msg, assistant_msg))
             else:
-                recent_pairs.insert(0, (user_msg,))
-        
-        # Add pairs until we exceed token limit
-        for pair in reversed(recent_pairs):  # Add most recent first
-            pair_tokens = self.estimate_message_tokens(list(pair))
-            if pair_tokens <= remaining_tokens:
-                additional_msgs.extend(pair)
-                remaining_tokens -= pair_tokens
-            else:
-                break
+                recent_pairs.append((user_msg,))
+        
+        # Keep the longest run of recent pairs whose running total fits; accumulate is
+        # lazy, so estimation stops at the first pair that overflows
+        running_tokens = accumulate(
+            sum(self._estimate_single(msg, token_cache) for msg in pair) for pair in recent_pairs
+        )
+        kept_totals = list(takewhile(lambda total: total <= remaining_tokens, running_tokens))
+        additional_msgs = [msg for pair in recent_pairs[:len(kept_totals)] for msg in pair]
         
-        # Combine all messages
+        # Combine all messages; the running total already covers the added pairs
         final_msgs = system_msgs[:1] + additional_msgs + [user_msgs[-1]]
-        final_tokens = self.estimate_message_tokens(final_msgs)
+        final_tokens = required_tokens + (kept_totals[-1] if kept_totals else 0)
         
-        debug_logger.info(f"Smart truncation: {len(messages)} → {len(final_msgs)} messages, ~{final_tokens} tokens")
+        debug_logger.info("Smart truncation: %d → %d messages, ~%d tokens", len(messages), len(final_msgs), final_tokens)
         return final_msgs, final_tokens
     
-    def _truncate_single_message(self, messages: List[Dict[str, Any]], target_tokens: int) -> Tuple[List[Dict[str, Any]], int]:
+    def _truncate_single_message(self, messages: List[Dict[str, Any]], target_tokens: int,
+                                 token_cache: Optional[Dict[int, int]] = None) -> Tuple[List[Dict[str, Any]], int]:
         """Truncate content within individual messages if they're too large"""
         if not messages:
             return messages, 0
+        if token_cache is None:
+            token_cache = {}
         
         # Find the largest message to truncate
         largest_idx = 0
         largest_tokens = 0
+        total_tokens = 0
         
         for i, msg in enumerate(messages):
-            msg_tokens = self.estimate_message_tokens([msg])
+            msg_tokens = self._estimate_single(msg, token_cache)
+            total_tokens += msg_tokens
             if msg_tokens > largest_tokens:
                 largest_tokens = msg_tokens
                 largest_idx = i
         
+        # The other kept messages stay whole, so the largest one only gets what they leave
+        budget = max(target_tokens - (total_tokens - largest_tokens), 0)
+        
         # Truncate the largest message's content
-        msg = messages[largest_idx].copy()
+        msg = messages[largest_idx]
         content = msg.get('content', '')
+        truncated_content = None
         
         if isinstance(content, str):
-            # Simple text truncation
-            # Rough calculation: keep target_tokens * 3 characters
-            target_chars = target_tokens * 3
-            if len(content) > target_chars:
-                truncated = content[:target_chars] + "... [truncated for context limit]"
-                msg['content'] = truncated
+            # Simple text truncation, on a token boundary when tiktoken is available
+            kept_text = _truncate_text(content, budget)
+            if kept_text is not None:
+                truncated_content = kept_text + "... [truncated for context limit]"
         elif isinstance(content, list):
             # Complex content (images, etc.) - keep first few elements
             # Try to preserve at least one element
-            preserved_content = content[:max(1, target_tokens // 1000)]  
+            preserved_content = content[:max(1, budget // 1000)]  
             if len(preserved_content) < len(content):
                 preserved_content.append({
                     "type": "text", 
                     "text": f"... [truncated {len(content) - len(preserved_content)} elements for context limit]"
                 })
-            msg['content'] = preserved_content
-        
-        messages[largest_idx] = msg
-        return messages, self.estimate_message_tokens(messages)
+                truncated_content = preserved_content
+        
+        # Only copy the message when its content actually changes; the original belongs to the caller
+        if truncated_content is not None:
+            msg = msg.copy()
+            msg['content'] = truncated_content
+            messages[largest_idx] = msg
+        return messages, sum(self._estimate_single(m, token_cache) for m in messages)
     
     async def handle_context_overflow_async(self,
                                           messages: List[Dict[str, Any]],
@@ -869,7 +1109,7 @@ class ContextWindowManager:
                 }
                 
         except Exception as e:
-            debug_logger.error(f"Intelligent context management failed: {e}")
+            debug_logger.error("Intelligent context management failed: %s", e)
             # Fallback to traditional method
             return await self._fallback_traditional_handling(messages, is_vision, max_tokens, image_descriptions)
     
@@ -887,9 +1127,9 @@ class ContextWindowManager:
             return messages, {"truncated": False, "original_tokens": current_tokens}
         
         # Get real limit for this endpoint type
-        real_limit = REAL_VISION_MODEL_TOKENS if is_vision else REAL_TEXT_MODEL_TOKENS
+        real_limit = self.get_context_limit(is_vision)
         
-        debug_logger.warning(f"Context overflow detected: {current_tokens} tokens exceeds limit {real_limit}")
+        debug_logger.warning("Context overflow detected: %d tokens exceeds limit %d", current_tokens, real_limit)
         
         # Try AI condensation first if available
         if CONDENSATION_AVAILABLE:
@@ -919,7 +1159,7 @@ class ContextWindowManager:
                             "method": "ai_condensation_fallback"
                         }
                         
-                        debug_logger.info(f"AI condensation successful (fallback): saved {condensation_metadata.get('tokens_saved', 0)} tokens")
+                        debug_logger.info("AI condensation successful (fallback): saved %s tokens", condensation_metadata.get('tokens_saved', 0))
                         return condensed_messages, metadata
                     else:
                         debug_logger.warning("AI condensation insufficient, falling back to truncation")
@@ -927,7 +1167,7 @@ class ContextWindowManager:
                     debug_logger.info("AI condensation not applied, using traditional truncation")
                     
             except Exception as e:
-                debug_logger.error(f"AI condensation failed (fallback): {e}")
+                debug_logger.error("AI condensation failed (fallback): %s", e)
                 debug_logger.info("Falling back to traditional truncation")
         
         # Fallback to traditional truncation
@@ -937,8 +1177,8 @@ class ContextWindowManager:
         api_overhead = 100  # Minimal buffer for API protocol overhead
         target_tokens = real_limit - api_overhead
         
-        debug_logger.warning(f"UNAVOIDABLE truncation: {current_tokens} tokens exceeds hard limit {real_limit}")
-        debug_logger.info(f"Client should manage context when possible - this is emergency truncation")
+        debug_logger.warning("UNAVOIDABLE truncation: %d tokens exceeds hard limit %d", current_tokens, real_limit)
+        debug_logger.info("Client should manage context when possible - this is emergency truncation")
         
         # Perform smart truncation to just under hard limit
         truncated_msgs, final_tokens = self.truncate_messages_smart(messages, target_tokens)
@@ -976,17 +1216,17 @@ class ContextWindowManager:
         - (processed_messages, metadata)
         """
         try:
-            # Analyze context state first
-            analysis = self.analyze_context_state(messages, is_vision, image_descriptions, max_tokens)
-            
-            # Validate context window
+            # Validate first and hand its token count (the full estimate, or the quick
+            # check's chars/4 average) to the analysis so the messages are not estimated again
             is_valid, current_tokens, reason = self.validate_context_window(messages, is_vision, max_tokens, image_descriptions)
+            analysis = self.analyze_context_state(messages, is_vision, image_descriptions, max_tokens,
+                                                  current_tokens=current_tokens)
             
             if is_valid:
                 return messages, {
                     "truncated": False,
-                    "original_tokens": current_tokens,
-                    "final_tokens": current_tokens,
+                    "original_tokens": analysis.current_tokens,
+                    "final_tokens": analysis.current_tokens,
                     "risk_level": analysis.risk_level.value,
                     "utilization_percent": analysis.utilization_percent,
                     "recommended_strategy": analysis.recommended_strategy.value,
@@ -996,17 +1236,17 @@ class ContextWindowManager:
             
             # For overflow cases in sync mode, we can only do traditional truncation
             # but we provide detailed analysis and recommendations
-            real_limit = REAL_VISION_MODEL_TOKENS if is_vision else REAL_TEXT_MODEL_TOKENS
+            real_limit = self.get_context_limit(is_vision)
             
-            debug_logger.warning(f"Context overflow in sync mode: {current_tokens} tokens exceeds hard limit {real_limit}")
-            debug_logger.info(f"Risk level: {analysis.risk_level.value}, Recommended strategy: {analysis.recommended_strategy.value}")
+            debug_logger.warning("Context overflow in sync mode: %d tokens exceeds hard limit %d", current_tokens, real_limit)
+            debug_logger.info("Risk level: %s, Recommended strategy: %s", analysis.risk_level.value, analysis.recommended_strategy.value)
             
             # Only truncate when we exceed HARD limits that would cause API rejection
             api_overhead = 100  # Minimal buffer for API protocol overhead
             target_tokens = real_limit - api_overhead
             
-            debug_logger.warning(f"UNAVOIDABLE truncation: {current_tokens} tokens exceeds hard limit {real_limit}")
-            debug_logger.info(f"Client should manage context when possible - this is emergency truncation")
+            debug_logger.warning("UNAVOIDABLE truncation: %d tokens exceeds hard limit %d", current_tokens, real_limit)
+            debug_logger.info("Client should manage context when possible - this is emergency truncation")
             
             # Perform smart truncation to just under hard limit
             truncated_msgs, final_tokens = self.truncate_messages_smart(messages, target_tokens)
@@ -1028,7 +1268,7 @@ class ContextWindowManager:
             return truncated_msgs, metadata
             
         except Exception as e:
-            debug_logger.error(f"Enhanced context management failed: {e}")
+            debug_logger.error("Enhanced context management failed: %s", e)
             # Fallback to basic handling
             return self._basic_sync_handling(messages, is_vision, max_tokens, image_descriptions)
     
@@ -1046,14 +1286,14 @@ class ContextWindowManager:
             return messages, {"truncated": False, "original_tokens": current_tokens}
         
         # Only truncate when we exceed HARD limits that would cause API rejection
-        real_limit = REAL_VISION_MODEL_TOKENS if is_vision else REAL_TEXT_MODEL_TOKENS
+        real_limit = self.get_context_limit(is_vision)
         
         # Calculate minimal target - leave small buffer only for API overhead (not response)
         api_overhead = 100  # Minimal buffer for API protocol overhead
         target_tokens = real_limit - api_overhead
         
-        debug_logger.warning(f"UNAVOIDABLE truncation: {current_tokens} tokens exceeds hard limit {real_limit}")
-        debug_logger.info(f"Client should manage context when possible - this is emergency truncation")
+        debug_logger.warning("UNAVOIDABLE truncation: %d tokens exceeds hard limit %d", current_tokens, real_limit)
+        debug_logger.info("Client should manage context when possible - this is emergency truncation")
         
         # Perform smart truncation to just under hard limit
         truncated_msgs, final_tokens = self.truncate_messages_smart(messages, target_tokens)
@@ -1077,6 +1317,7 @@ class ContextWindowManager:
         return {
             "cache_size": len(self._analysis_cache),
             "cache_limit": CONTEXT_CACHE_SIZE,
+            "message_token_cache_size": len(self._message_token_cache),
             "condensation_engine_available": self.condensation_engine is not None,
             "accurate_token_counter_available": self.token_counter is not None,
             "ai_condensation_enabled": ENABLE_AI_CONDENSATION,
@@ -1093,6 +1334,8 @@ class ContextWindowManager:
         """Clear all internal caches"""
         self._analysis_cache.clear()
         self._cache_timestamps.clear()
+        with self._message_token_cache_lock:
+            self._message_token_cache.clear()
         
         if self.token_counter:
             self.token_counter.clear_cache()
@@ -1237,11 +1480,12 @@ def get_context_info(messages: List[Dict[str, Any]], is_vision: bool,
     """
     # Get basic context info
     estimated_tokens = context_manager.estimate_message_tokens(messages, image_descriptions, "openai" if is_vision else "anthropic")
-    hard_limit = REAL_VISION_MODEL_TOKENS if is_vision else REAL_TEXT_MODEL_TOKENS
+    hard_limit = context_manager.get_context_limit(is_vision)
     endpoint_type = "vision" if is_vision else "text"
     
     # Get intelligent analysis
-    analysis = context_manager.analyze_context_state(messages, is_vision, image_descriptions)
+    analysis = context_manager.analyze_context_state(messages, is_vision, image_descriptions,
+                                                     current_tokens=estimated_tokens)
     
     return {
         "estimated_tokens": estimated_tokens,
@@ -1288,7 +1532,7 @@ def get_simple_context_info(messages: List[Dict[str, Any]], is_vision: bool,
     - Basic context information (legacy format)
     """
     estimated_tokens = context_manager.estimate_message_tokens(messages, image_descriptions)
-    hard_limit = REAL_VISION_MODEL_TOKENS if is_vision else REAL_TEXT_MODEL_TOKENS
+    hard_limit = context_manager.get_context_limit(is_vision)
     endpoint_type = "vision" if is_vision else "text"
     
     return {
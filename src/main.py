@@ -1258,16 +1258,18 @@ def parse_sse_bytes_for_usage(content_bytes: bytes) -> Optional[Dict[str, Any]]:
 # ---------------------- Image detection ----------------------
 def content_block_has_image(cb: Any) -> bool:
     if not isinstance(cb, dict): return False
+    # Read the type once; text blocks (the common case) fall through both checks
     t = cb.get("type")
-    if t == "image" and isinstance(cb.get("source"), dict): return True
-    if t in ("input_image", "image_url") and (cb.get("source") or cb.get("url") or cb.get("image_url")): return True
-    if t == "image" and isinstance(cb.get("image"), (dict, str)): return True
+    if t == "image":
+        return isinstance(cb.get("source"), dict) or isinstance(cb.get("image"), (dict, str))
+    if t == "image_url" or t == "input_image":
+        return bool(cb.get("source") or cb.get("url") or cb.get("image_url"))
     return False
 
 def message_has_image(msg: Dict[str, Any]) -> bool:
     if not isinstance(msg, dict): return False
     c = msg.get("content")
-    if isinstance(c, list): return any(content_block_has_image(b) for b in c if isinstance(b, dict))
+    if isinstance(c, list): return any(map(content_block_has_image, c))
     if isinstance(c, dict) and content_block_has_image(c): return True
     return False
 
@@ -5,10 +5,27 @@ import requests
 import json
 import base64
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+# Shared example helpers (JSON encoding with optional orjson)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "examples"))
+from _common import dumps, loads
 
 load_dotenv()
 
+# One pooled session so every test payload reuses the same upstream connection
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+# Small test image (1x1 pixel PNG), built into a data URL once for every payload
+_SMALL_PNG_B64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChAI9jU77yAAAAABJRU5ErkJggg=="
+_DATA_URL = "data:image/png;base64," + _SMALL_PNG_B64
+
 def debug_image_payload():
     """Test what happens when we send an image to OpenAI endpoint"""
     api_key = os.getenv("SERVER_API_KEY")
@@ -16,9 +33,6 @@ def debug_image_payload():
     
     print(f"📝 Testing OpenAI endpoint with image: {openai_base}")
     
-    # Create a small test image (1x1 pixel PNG)
-    small_png_base64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChAI9jU77yAAAAABJRU5ErkJggg=="
-    
     # Test different image formats that might be supported
     test_payloads = [
         {
@@ -36,7 +50,7 @@ def debug_image_payload():
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/png;base64,{small_png_base64}"
+                                    "url": _DATA_URL
                                 }
                             }
                         ]
@@ -52,7 +66,7 @@ def debug_image_payload():
                 "messages": [
                     {
                         "role": "user", 
-                        "content": f"data:image/png;base64,{small_png_base64}"
+                        "content": _DATA_URL
                     }
                 ],
                 "max_tokens": 100
@@ -73,7 +87,7 @@ def debug_image_payload():
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/png;base64,{small_png_base64}"
+                                    "url": _DATA_URL
                                 }
                             }
                         ]
@@ -89,7 +103,7 @@ def debug_image_payload():
                 "messages": [
                     {
                         "role": "user", 
-                        "content": f"What do you see? data:image/png;base64,{small_png_base64}"
+                        "content": "What do you see? " + _DATA_URL
                     }
                 ],
                 "max_tokens": 100
@@ -97,38 +111,50 @@ def debug_image_payload():
         }
     ]
     
-    for test_case in test_payloads:
-        print(f"\n🔍 Testing: {test_case['name']}")
-        test_direct_openai(openai_base, test_case['payload'], api_key)
+    # The payloads are independent, so send them concurrently and print the
+    # results in the original order once each request finishes
+    with ThreadPoolExecutor(max_workers=len(test_payloads)) as executor:
+        futures = [
+            executor.submit(test_direct_openai, openai_base, test_case['payload'], api_key)
+            for test_case in test_payloads
+        ]
+        for test_case, future in zip(test_payloads, futures):
+            print(f"\n🔍 Testing: {test_case['name']}")
+            print(future.result())
 
 def test_direct_openai(base_url, payload, api_key):
-    """Test direct request to OpenAI endpoint"""
+    """Test direct request to OpenAI endpoint, returning the report as text"""
+    lines = []
     try:
-        response = requests.post(
+        # stream=True defers reading the body; the with block hands the
+        # connection back to the session pool as soon as it has been parsed
+        with _SESSION.post(
             f"{base_url.rstrip('/')}/chat/completions",
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {api_key}"
             },
-            json=payload,
-            timeout=30
-        )
-        
-        print(f"  Status: {response.status_code}")
-        try:
-            response_data = response.json()
-            if response.status_code == 200:
-                print(f"  ✅ Success! Model: {response_data.get('model', 'unknown')}")
-                if 'choices' in response_data and response_data['choices']:
-                    content = response_data['choices'][0].get('message', {}).get('content', '')[:100]
-                    print(f"  Response: {content}...")
-            else:
-                print(f"  ❌ Error: {json.dumps(response_data, indent=2)}")
-        except:
-            print(f"  Response (raw): {response.text[:300]}...")
+            data=dumps(payload),
+            timeout=30,
+            stream=True
+        ) as response:
+            lines.append(f"  Status: {response.status_code}")
+            try:
+                response_data = loads(response.content)
+                if response.status_code == 200:
+                    lines.append(f"  ✅ Success! Model: {response_data.get('model', 'unknown')}")
+                    if 'choices' in response_data and response_data['choices']:
+                        content = response_data['choices'][0].get('message', {}).get('content', '')[:100]
+                        lines.append(f"  Response: {content}...")
+                else:
+                    lines.append(f"  ❌ Error: {json.dumps(response_data, indent=2)}")
+            except:
+                lines.append(f"  Response (raw): {response.text[:300]}...")
             
     except Exception as e:
-        print(f"  ❌ Error: {e}")
+        lines.append(f"  ❌ Error: {e}")
+
+    return "\n".join(lines)
 
 if __name__ == "__main__":
     debug_image_payload()
\ No newline at end of file
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Tests for ContextWindowManager smart truncation
+
+Covers which messages truncate_messages_smart keeps, the token totals it
+reports, and that each message is only estimated once per truncation pass
+or context overflow check.
+"""
+
+import os
+import sys
+
+# Add project root to path so src can be imported as a package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import pytest
+import src.context_window_manager as context_window_manager
+from src.context_window_manager import ContextWindowManager, _truncate_text
+
+
+def make_conversation(turns: int, words_per_message: int = 50):
+    """Build a system message followed by alternating user/assistant turns"""
+    messages = [{"role": "system", "content": "You are a helpful assistant."}]
+    for i in range(turns):
+        role = "user" if i % 2 == 0 else "assistant"
+        messages.append({"role": role, "content": f"message {i} " + "word " * words_per_message})
+    return messages
+
+
+@pytest.fixture
+def manager():
+    return ContextWindowManager()
+
+
+class TestTruncateMessagesSmart:
+    """Test truncate_messages_smart"""
+
+    def test_keeps_system_and_last_user_message(self, manager):
+        messages = make_conversation(21)
+        last_user = [m for m in messages if m["role"] == "user"][-1]
+
+        truncated, _ = manager.truncate_messages_smart(messages, 400)
+
+        assert truncated[0] is messages[0]
+        assert truncated[-1] is last_user
+        assert len(truncated) < len(messages)
+
+    def test_reported_tokens_match_estimate(self, manager):
+        messages = make_conversation(21)
+
+        truncated, tokens = manager.truncate_messages_smart(messages, 400)
+
+        assert tokens == manager.estimate_message_tokens(truncated)
+        assert tokens <= 400
+
+    def test_no_user_messages_returned_unchanged(self, manager):
+        messages = [{"role": "system", "content": "You are a helpful assistant."}]
+
+        truncated, tokens = manager.truncate_messages_smart(messages, 10)
+
+        assert truncated is messages
+        assert tokens == manager.estimate_message_tokens(messages)
+
+    def test_each_message_estimated_once(self, manager, monkeypatch):
+        messages = make_conversation(41)
+        estimated = []
+        original = manager.estimate_message_tokens
+
+        def spy(msgs, *args, **kwargs):
+            estimated.extend(id(m) for m in msgs)
+            return original(msgs, *args, **kwargs)
+
+        monkeypatch.setattr(manager, "estimate_message_tokens", spy)
+        manager.truncate_messages_smart(messages, 1000)
+
+        assert len(estimated) == len(set(estimated))
+
+    def test_plain_messages_reuse_counts_across_passes(self, manager, monkeypatch):
+        messages = [{"role": m["role"], "content": m["content"]} for m in make_conversation(21)]
+        first, first_tokens = manager.truncate_messages_smart(messages, 400)
+        calls = []
+        original = manager.estimate_message_tokens
+
+        def spy(msgs, *args, **kwargs):
+            calls.append(msgs)
+            return original(msgs, *args, **kwargs)
+
+        monkeypatch.setattr(manager, "estimate_message_tokens", spy)
+        copies = [dict(m) for m in messages]
+        second, second_tokens = manager.truncate_messages_smart(copies, 400)
+
+        assert calls == []
+        assert second == first
+        assert second_tokens == first_tokens
+
+    def test_cross_request_cache_does_not_hold_content(self, manager):
+        messages = [{"role": "user", "content": "body " * 5000}]
+        manager.truncate_messages_smart(messages, 400)
+
+        assert manager._message_token_cache
+        assert all(isinstance(digest, bytes) and len(digest) <= 64
+                   for _, digest in manager._message_token_cache)
+
+
+class ByteEncoding:
+    """Stand-in tokenizer with one token per UTF-8 byte, so cuts can land inside a character"""
+
+    def encode_ordinary(self, text):
+        return list(text.encode("utf-8"))
+
+    def encode_ordinary_batch(self, texts):
+        return [self.encode_ordinary(text) for text in texts]
+
+    def decode_bytes(self, ids):
+        return bytes(ids)
+
+
+class RunEncoding:
+    """Stand-in tokenizer for highly compressible text, with one token per 32 characters"""
+
+    def encode_ordinary(self, text):
+        return [text[i:i + 32] for i in range(0, len(text), 32)]
+
+    def encode_ordinary_batch(self, texts):
+        return [self.encode_ordinary(text) for text in texts]
+
+    def decode_bytes(self, ids):
+        return "".join(ids).encode("utf-8")
+
+
+class TestTruncateSingleMessage:
+    """Test truncation of an oversized required message"""
+
+    def test_other_required_messages_count_toward_target(self, manager):
+        messages = [
+            {"role": "system", "content": "rule " * 8000},
+            {"role": "user", "content": "question " * 40000},
+        ]
+
+        truncated, tokens = manager.truncate_messages_smart(messages, 20000)
+
+        assert truncated[0] is messages[0]
+        assert tokens == manager.estimate_message_tokens(truncated)
+        assert tokens <= 20000
+
+    def test_token_cut_drops_partial_character(self, monkeypatch):
+        monkeypatch.setattr(context_window_manager, "TIKTOKEN_AVAILABLE", True)
+        monkeypatch.setattr(context_window_manager, "_ENCODING", ByteEncoding())
+
+        # 27 tokens less the 16 reserved leaves 11 bytes, ending halfway through a character
+        kept = _truncate_text("é" * 100, 27)
+
+        assert kept == "é" * 5
+        assert "\ufffd" not in kept
+
+    def test_compressible_text_is_cut_at_the_budget(self, monkeypatch):
+        monkeypatch.setattr(context_window_manager, "TIKTOKEN_AVAILABLE", True)
+        monkeypatch.setattr(context_window_manager, "_ENCODING", RunEncoding())
+
+        # 116 tokens less the 16 reserved leaves 100 tokens of 32 characters each
+        assert _truncate_text("a" * 10000, 116) == "a" * 3200
+        assert _truncate_text("a" * 3000, 116) is None
+
+
+class TestOverflowEstimation:
+    """Test that overflow handling estimates the full message list once"""
+
+    def test_overflow_estimates_full_list_once(self, manager, monkeypatch):
+        messages = make_conversation(41, words_per_message=20000)
+        full_list_calls = []
+        original = manager.estimate_message_tokens
+
+        def spy(msgs, *args, **kwargs):
+            if msgs is messages:
+                full_list_calls.append(msgs)
+            return original(msgs, *args, **kwargs)
+
+        monkeypatch.setattr(manager, "estimate_message_tokens", spy)
+        truncated, metadata = manager.handle_context_overflow(messages, False, 1000)
+
+        assert metadata["truncated"] is True
+        assert len(full_list_calls) == 1
+
+
+class TestQuickCheck:
+    """Test the quick validation path that skips full token estimation"""
+
+    def test_quick_path_skips_full_estimate(self, manager, monkeypatch):
+        messages = make_conversation(40, words_per_message=400)
+        full_estimate = manager.estimate_message_tokens(messages)
+        calls = []
+        original = manager.estimate_message_tokens
+
+        def spy(msgs, *args, **kwargs):
+            calls.append(msgs)
+            return original(msgs, *args, **kwargs)
+
+        monkeypatch.setattr(manager, "estimate_message_tokens", spy)
+        processed, metadata = manager.handle_context_overflow(messages, False, 1000)
+
+        assert processed is messages
+        assert calls == []
+        # The reported count is the chars/4 average, not the byte-based upper bound
+        quick_chars, token_bound = manager._quick_size(messages)
+        assert metadata["original_tokens"] == quick_chars // 4
+        assert metadata["original_tokens"] == pytest.approx(full_estimate, rel=0.25)
+        assert token_bound > metadata["original_tokens"] * 3
+        limit = manager.get_context_limit(False)
+        assert metadata["utilization_percent"] == pytest.approx(metadata["original_tokens"] / limit * 100)
+
+    def test_bound_covers_multibyte_text_and_metadata(self, manager):
+        emoji = "😀" * 1000
+        _, plain = manager._quick_size([{"role": "tool", "content": "x"}])
+        _, bound = manager._quick_size([{"role": "tool", "content": emoji, "tool_call_id": "call_1"}])
+
+        assert bound - plain >= len(emoji.encode("utf-8")) + len("call_1") - 1
+
+    def test_images_go_through_full_estimate(self, manager):
+        messages = [{"role": "user", "content": [{"type": "image_url", "image_url": {"url": "x"}}]}]
+        assert manager._quick_size(messages) is None
+
+    def test_quick_count_does_not_leak_into_full_analysis(self, manager):
+        messages = make_conversation(40, words_per_message=400)
+        manager.handle_context_overflow(messages, False, 1000)
+
+        full_estimate = manager.estimate_message_tokens(messages)
+        analysis = manager.analyze_context_state(messages, False, current_tokens=full_estimate)
+
+        assert analysis.current_tokens == full_estimate